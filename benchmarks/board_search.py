@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from pinboard.models.note import Note
+from pinboard.storage.board_index import BoardIndex
+from pinboard.storage.yaml_storage import save_notes
+
+DEFAULT_BOARDS = 500
+NOTES_PER_BOARD = 100
+VOCABULARY_SIZE = 20_000
+QUERIES = ["meeting", "meet", "meetnig", "release notes", "zzzzzz"]
+
+
+def make_boards(directory: Path, count: int) -> None:
+    rng = random.Random(0)
+    vocabulary = ["meeting", "release", "notes"] + [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(VOCABULARY_SIZE)
+    ]
+    for board in range(count):
+        notes = [
+            Note(id=i, x=i * 260, y=0, width=240, height=160, text=" ".join(rng.choices(vocabulary, k=12)), order=i)
+            for i in range(1, NOTES_PER_BOARD + 1)
+        ]
+        save_notes(directory / f"board{board:04}.yaml", notes)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index build, refresh and query cost of `pinboard search`")
+    parser.add_argument("boards", type=int, nargs="?", default=DEFAULT_BOARDS)
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp())
+    try:
+        make_boards(directory, args.boards)
+        index = BoardIndex(directory)
+        (count, _), elapsed = timed(lambda: index.update(args.jobs))
+        print(f"first build: {count} boards in {elapsed:.2f}s")
+        (count, _), elapsed = timed(lambda: index.update(args.jobs))
+        print(f"refresh, nothing changed: {elapsed * 1000:.1f}ms")
+        (directory / "board0000.yaml").write_text("notes: []\n")
+        (count, _), elapsed = timed(lambda: index.update(args.jobs))
+        print(f"refresh, {count} board changed: {elapsed * 1000:.1f}ms")
+        for query in QUERIES:
+            hits, elapsed = timed(lambda: index.search(query))
+            print(f"{query!r:>18}: {len(hits):>6} hits in {elapsed * 1000:6.2f}ms")
+        index.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from pinboard.commands.bench import per_call
+from pinboard.storage.yaml_storage import load_config
+from pinboard.synthetic import make_notes
+from pinboard.undo_manager import UndoManager
+from pinboard.widgets.canvas import PinboardCanvas
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000]
+REPEAT = 2000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call cost of canvas hot paths")
+    parser.add_argument("sizes", type=int, nargs="*", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    config = load_config()
+    print(f"{'notes':>8} {'select_next':>12} {'select_prev':>12} {'is_editing':>12} {'max_order':>12}")
+    for size in args.sizes:
+        canvas = PinboardCanvas(config, UndoManager())
+        canvas.load_notes(make_notes(size))
+        print(
+            f"{size:>8}"
+            f" {per_call(canvas.select_next_note, REPEAT)[0] * 1e6:10.1f}us"
+            f" {per_call(canvas.select_prev_note, REPEAT)[0] * 1e6:10.1f}us"
+            f" {per_call(canvas.is_editing, REPEAT)[0] * 1e6:10.1f}us"
+            f" {per_call(canvas.get_max_order, REPEAT)[0] * 1e6:10.1f}us"
+        )
+        canvas.deleteLater()
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pinboard.storage.backend import load_notes
+
+DEFAULT_WRITERS = 32
+DEFAULT_NOTES = 4
+BOARDS = {
+    "yaml": ("board.yaml", False),
+    "yaml+journal": ("board.yaml", True),
+    "sqlite": ("board.pinboard.db", False),
+}
+
+
+def push(env: dict, board: Path, writer: int, notes: int) -> None:
+    for i in range(notes):
+        subprocess.run(
+            [sys.executable, "-m", "pinboard.cli", "push", str(board), f"writer {writer} note {i}"],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+
+def stress(name: str, writers: int, notes: int) -> bool:
+    filename, use_journal = BOARDS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp) / "home"
+        config = home / ".config" / "pinboard" / "config.yaml"
+        config.parent.mkdir(parents=True)
+        config.write_text(f"journal: {str(use_journal).lower()}\n")
+        env = dict(os.environ, HOME=str(home))
+        board = Path(tmp) / filename
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            for future in [pool.submit(push, env, board, w, notes) for w in range(writers)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        loaded = load_notes(board)
+        expected = {f"writer {w} note {i}" for w in range(writers) for i in range(notes)}
+        texts = [note.text for note in loaded]
+        ids = [note.id for note in loaded]
+        lost = expected - set(texts)
+        duplicate_ids = len(ids) - len(set(ids))
+        ok = not lost and duplicate_ids == 0 and len(texts) == len(expected)
+        print(
+            f"{name:>12}: {len(texts)}/{len(expected)} notes, {len(lost)} lost, "
+            f"{duplicate_ids} duplicate ids in {elapsed:.1f}s {'ok' if ok else 'FAILED'}"
+        )
+        return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel `pinboard push` writers against one board")
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS)
+    parser.add_argument("--notes", type=int, default=DEFAULT_NOTES, help="Notes pushed by each writer")
+    parser.add_argument("--board", choices=sorted(BOARDS), action="append", help="Board kinds to stress (default: all)")
+    args = parser.parse_args()
+
+    results = [stress(name, args.writers, args.notes) for name in args.board or BOARDS]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from pinboard.commands.bench import timed
+from pinboard.models.note import Note
+from pinboard.models.note_store import NoteStore
+from pinboard.storage.yaml_storage import load_config
+from pinboard.synthetic import make_notes
+from pinboard.undo_manager import UndoManager
+from pinboard.widgets.canvas import PinboardCanvas
+
+DEFAULT_SIZE = 100_000
+
+
+def allocated(build) -> tuple[object, int]:
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory and snapshot cost of NoteStore against per-note objects")
+    parser.add_argument("size", type=int, nargs="?", default=DEFAULT_SIZE)
+    args = parser.parse_args()
+
+    notes = make_notes(args.size)
+    _, list_bytes = allocated(lambda: [Note(**vars(n)) for n in notes])
+    store, store_bytes = allocated(lambda: NoteStore(notes))
+    print(f"memory per note: Note list {list_bytes / args.size:.0f} B, NoteStore {store_bytes / args.size:.0f} B")
+
+    app = QApplication([])
+    canvas = PinboardCanvas(load_config(), UndoManager())
+    canvas.load_notes(notes)
+    while canvas.is_loading():
+        app.processEvents()
+
+    items = list(canvas._notes.values())
+    from_items = timed(lambda: [item.to_note() for item in items])
+    snapshot = timed(canvas.snapshot)
+    to_notes = timed(store.to_notes)
+    print(f"snapshot on GUI thread: from items {from_items:.3f}s, NoteStore.copy {snapshot:.4f}s")
+    print(f"NoteStore.to_notes (saver thread): {to_notes:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
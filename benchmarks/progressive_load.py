@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QEventLoop
+from PySide6.QtWidgets import QApplication
+
+from pinboard.models.note import Note
+from pinboard.storage.yaml_storage import load_config
+from pinboard.synthetic import make_notes
+from pinboard.undo_manager import UndoManager
+from pinboard.widgets import canvas as canvas_module
+from pinboard.widgets.canvas import PinboardCanvas
+
+DEFAULT_SIZES = [10_000, 50_000]
+
+
+def measure(config, notes: list[Note]) -> tuple[float, float, float]:
+    canvas = PinboardCanvas(config, UndoManager())
+    canvas.resize(1280, 800)
+    timings: list[tuple[float, float]] = []
+    loop = QEventLoop()
+    canvas.loaded.connect(lambda first_paint, loaded: (timings.append((first_paint, loaded)), loop.quit()))
+
+    start = time.perf_counter()
+    canvas.load_notes(notes)
+    blocked = time.perf_counter() - start
+    canvas.show()
+    if not timings:
+        loop.exec()
+    canvas.close()
+    canvas.deleteLater()
+    return blocked, *timings[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time to first paint and to fully loaded for large boards")
+    parser.add_argument("sizes", type=int, nargs="*", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    config = load_config()
+    eager_limit = canvas_module.EAGER_LOAD_LIMIT
+    print(f"{'notes':>8} {'mode':>12} {'load_notes':>12} {'first paint':>12} {'loaded':>12}")
+    for size in args.sizes:
+        notes = make_notes(size)
+        for mode, limit in [("eager", size), ("progressive", eager_limit)]:
+            canvas_module.EAGER_LOAD_LIMIT = limit
+            blocked, first_paint, loaded = measure(config, notes)
+            print(f"{size:>8} {mode:>12} {blocked:11.3f}s {first_paint:11.3f}s {loaded:11.3f}s")
+            app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    canvas_module.EAGER_LOAD_LIMIT = eager_limit
+
+
+if __name__ == "__main__":
+    main()
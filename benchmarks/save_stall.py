@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QElapsedTimer, QTimer
+from PySide6.QtWidgets import QApplication
+
+from pinboard.models.note import Note
+from pinboard.saver import BackgroundSaver
+from pinboard.storage.yaml_storage import save_notes
+from pinboard.synthetic import make_notes
+
+TICK_MS = 1
+
+
+def measure(app: QApplication, save, notes: list[Note], rounds: int, busy=lambda: False) -> float:
+    clock = QElapsedTimer()
+    max_gap = 0
+    last = 0
+    remaining = rounds
+
+    def tick() -> None:
+        nonlocal last, max_gap
+        now = clock.elapsed()
+        max_gap = max(max_gap, now - last)
+        last = now
+
+    def trigger() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if remaining >= 0:
+            save(notes)
+        elif not busy():
+            app.quit()
+
+    ticker = QTimer()
+    ticker.timeout.connect(tick)
+    trigger_timer = QTimer()
+    trigger_timer.timeout.connect(trigger)
+
+    clock.start()
+    ticker.start(TICK_MS)
+    trigger_timer.start(200)
+    app.exec()
+    ticker.stop()
+    trigger_timer.stop()
+    return max_gap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event-loop stall while saving")
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    notes = make_notes(args.notes)
+    path = Path(tempfile.mkdtemp()) / "board.yaml"
+
+    sync_gap = measure(app, lambda n: save_notes(path, n), notes, args.rounds)
+    saver = BackgroundSaver(path)
+    background_gap = measure(app, saver.save, notes, args.rounds, saver.is_busy)
+    saver.flush(notes)
+
+    print(f"notes={args.notes}")
+    print(f"sync save:       max event-loop stall {sync_gap} ms")
+    print(f"background save: max event-loop stall {background_gap} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import string
+import time
+
+from pinboard.search_index import SearchIndex
+
+DEFAULT_SIZE = 100_000
+VOCABULARY_SIZE = 50_000
+QUERIES = ["meeting", "mee", "meetnig", "proj", "project plan", "release notes q3", "zzzz"]
+COMMON_WORDS = ["meeting", "project", "plan", "release", "notes", "q3", "todo", "review", "design", "bug"]
+
+
+def make_texts(count: int) -> list[tuple[int, str]]:
+    rng = random.Random(0)
+    vocabulary = COMMON_WORDS + [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(VOCABULARY_SIZE)
+    ]
+    # Zipf-like word frequencies, as in real text.
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    return [
+        (note_id, " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(3, 40))))
+        for note_id in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build and query cost of the note search index")
+    parser.add_argument("size", type=int, nargs="?", default=DEFAULT_SIZE)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = make_texts(args.size)
+    start = time.perf_counter()
+    index = SearchIndex.build(texts)
+    print(f"build {args.size} notes: {time.perf_counter() - start:.2f}s")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            hits = index.search(query)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{query!r:>20}: {len(hits):>7} hits in {elapsed * 1000:6.2f}ms")
+
+    start = time.perf_counter()
+    for note_id, text in texts[: args.repeat * 50]:
+        index.update(note_id, text + " edited")
+    print(f"update: {(time.perf_counter() - start) / (args.repeat * 50) * 1e6:.0f}us per note")
+
+
+if __name__ == "__main__":
+    main()
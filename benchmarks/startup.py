@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+HEADLESS_IMPORTS = "import pinboard.cli, pinboard.commands.push"
+FORBIDDEN_PREFIXES = ("PySide6", "shiboken6")
+
+
+def import_times(statement: str) -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        depth = len(module) - len(module.lstrip())
+        times[module.strip()] = (int(cumulative), depth)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import cost of the headless CLI path")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    times = import_times(HEADLESS_IMPORTS)
+    top_depth = min(depth for _, depth in times.values())
+    total = sum(us for us, depth in times.values() if depth == top_depth)
+    for module, (us, _) in sorted(times.items(), key=lambda kv: -kv[1][0])[: args.top]:
+        print(f"{us / 1000:8.1f} ms  {module}")
+    print(f"{total / 1000:8.1f} ms  total (top-level imports)")
+
+    forbidden = sorted(m for m in times if m.split(".")[0] in FORBIDDEN_PREFIXES)
+    if forbidden:
+        print(f"FAIL: headless path imports Qt: {', '.join(forbidden[:5])}")
+        sys.exit(1)
+    print("OK: headless path does not import Qt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from pinboard.commands.bench import timed
+from pinboard.models.note import Note
+from pinboard.storage import parse_cache
+from pinboard.storage.yaml_storage import load_notes, save_notes
+from pinboard.synthetic import make_notes
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def parse_with(path: Path, loader: type) -> list[Note]:
+    with open(path, "rb") as f:
+        data = yaml.load(f, Loader=loader)
+    return [Note.from_dict(n) for n in data["notes"]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare board load strategies")
+    parser.add_argument("sizes", type=int, nargs="*", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    print(f"{'notes':>8} {'pure python':>12} {'libyaml':>12} {'cache hit':>12}")
+    for size in args.sizes:
+        path = Path(tempfile.mkdtemp()) / "board.yaml"
+        save_notes(path, make_notes(size))
+
+        pure = timed(lambda: parse_with(path, yaml.SafeLoader))
+        if hasattr(yaml, "CSafeLoader"):
+            c_accel = f"{timed(lambda: parse_with(path, yaml.CSafeLoader)):11.3f}s"
+        else:
+            c_accel = f"{'n/a':>12}"
+
+        parse_cache.cache_path(path).unlink(missing_ok=True)
+        load_notes(path, use_cache=True)
+        cached = timed(lambda: load_notes(path, use_cache=True))
+
+        print(f"{size:>8} {pure:11.3f}s {c_accel} {cached:11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
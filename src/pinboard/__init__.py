@@ -1,3 +1,16 @@
-from pinboard.api import PinboardAPI, pb
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pinboard.api import PinboardAPI, pb
 
 __all__ = ["PinboardAPI", "pb"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        from pinboard import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module 'pinboard' has no attribute {name!r}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING, Callable
 
 from PySide6.QtGui import QKeySequence, QShortcut
@@ -16,6 +17,9 @@ class PinboardAPI:
         self._window: MainWindow | None = None
         self._canvas: PinboardCanvas | None = None
         self._pending_keybindings: list[tuple[str, Callable]] = []
+        self._callback_calls = 0
+        self._callback_seconds = 0.0
+        self._last_callback_seconds = 0.0
 
     def _initialize(self, window: MainWindow, canvas: PinboardCanvas) -> None:
         self._window = window
@@ -49,7 +53,20 @@ class PinboardAPI:
 
     def _register_keybinding(self, key: str, callback: Callable) -> None:
         shortcut = QShortcut(QKeySequence(key), self._window)
-        shortcut.activated.connect(callback)
+        shortcut.activated.connect(lambda: self._run_callback(callback))
+
+    def _run_callback(self, callback: Callable) -> None:
+        start = time.perf_counter()
+        try:
+            callback()
+        finally:
+            self._last_callback_seconds = time.perf_counter() - start
+            self._callback_seconds += self._last_callback_seconds
+            self._callback_calls += 1
+
+    def callback_stats(self) -> tuple[int, float, float]:
+        # Calls, total and last duration of keybinding callbacks registered from config.py.
+        return self._callback_calls, self._callback_seconds, self._last_callback_seconds
 
     def get_file_path(self) -> str:
         if self._window is None:
@@ -3,8 +3,9 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from pinboard.commands import open as cmd_open
-from pinboard.commands import push as cmd_push
+# Subcommands are imported when dispatched, so each one only pays for its own dependencies.
+BENCH_TEXT_DISTRIBUTIONS = ("fixed", "uniform", "exponential")
+BENCH_DEFAULT_THRESHOLD = 0.10
 
 
 def main() -> None:
@@ -16,14 +17,85 @@ def main() -> None:
 
     push_parser = subparsers.add_parser("push", help="Add a new note via CLI")
     push_parser.add_argument("file", type=Path, help="Path to the YAML file")
-    push_parser.add_argument("text", help="Text content for the new note")
+    push_parser.add_argument("text", nargs="?", help="Text content for the new note")
+    push_parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read notes from stdin, one per line (plain text or JSON with text/color/x/y/width/height)",
+    )
+    push_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=0,
+        help="With --stdin, write every N notes instead of once at the end",
+    )
+
+    search_parser = subparsers.add_parser("search", help="Search the notes of every board in a directory")
+    search_parser.add_argument("directory", type=Path, help="Directory containing board files")
+    search_parser.add_argument("query", help="Words to find; each matches by prefix, or one typo away")
+    search_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for re-indexing changed boards (default: one per CPU)",
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="Time storage and canvas operations on a synthetic board")
+    bench_parser.add_argument("--notes", type=int, default=10_000, help="Notes on the synthetic board")
+    bench_parser.add_argument("--words", type=int, default=12, help="Mean words per note")
+    bench_parser.add_argument(
+        "--text-distribution",
+        choices=BENCH_TEXT_DISTRIBUTIONS,
+        default="exponential",
+        help="How word counts spread around the mean",
+    )
+    bench_parser.add_argument(
+        "--overlap", type=float, default=0.1, help="Fraction of notes placed on top of another (0 to 1)"
+    )
+    bench_parser.add_argument("--colors", type=int, default=0, help="Distinct random colors (default: the palette)")
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument("--format", choices=["yaml", "sqlite"], default="yaml", help="Board file format")
+    bench_parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark")
+    bench_parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    bench_parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="+",
+        metavar="RESULTS",
+        help="Compare against BASELINE; with a second file, compare the two files without running",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=BENCH_DEFAULT_THRESHOLD,
+        help="Slowdown that counts as a regression, as a fraction (default: %(default)s)",
+    )
+    bench_parser.add_argument("--generate", type=Path, metavar="FILE", help="Only write the synthetic board to FILE")
 
     args = parser.parse_args()
 
+    if args.command == "bench" and args.compare and len(args.compare) > 2:
+        bench_parser.error("--compare takes a baseline and at most one results file")
+
+    if args.command == "push" and (args.text is None) == (not args.stdin):
+        push_parser.error("provide either TEXT or --stdin")
+
     if args.command == "open":
+        from pinboard.commands import open as cmd_open
+
         cmd_open.run(args)
     elif args.command == "push":
+        from pinboard.commands import push as cmd_push
+
         cmd_push.run(args)
+    elif args.command == "search":
+        from pinboard.commands import search as cmd_search
+
+        cmd_search.run(args)
+    elif args.command == "bench":
+        from pinboard.commands import bench as cmd_bench
+
+        cmd_bench.run(args)
     else:
         raise ValueError(f"Unknown command: {args.command}")
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from PySide6.QtCore import QElapsedTimer, QObject, Qt, QTimer, Signal
+
+FRAME_INTERVAL_MS = 16
+
+
+@dataclass
+class CanvasUpdate:
+    viewport: bool = False
+    reloaded: bool = False
+    note_ids: set[int] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return self.viewport or self.reloaded or bool(self.note_ids)
+
+
+class SignalCoalescer(QObject):
+    flushed = Signal(object)  # CanvasUpdate
+
+    def __init__(self, interval_ms: int = FRAME_INTERVAL_MS, parent: QObject | None = None):
+        super().__init__(parent)
+        self._interval_ms = interval_ms
+        self._pending = CanvasUpdate()
+        self._since_flush = QElapsedTimer()
+        self._since_flush.start()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    def mark_viewport(self) -> None:
+        self._pending.viewport = True
+        self._schedule()
+
+    def mark_reloaded(self) -> None:
+        self._pending.reloaded = True
+        self._schedule()
+
+    def mark_note(self, note_id: int) -> None:
+        self._pending.note_ids.add(note_id)
+        self._schedule()
+
+    def mark_notes(self, note_ids: Iterable[int]) -> None:
+        self._pending.note_ids.update(note_ids)
+        self._schedule()
+
+    def discard(self) -> None:
+        self._timer.stop()
+        self._pending = CanvasUpdate()
+
+    def flush(self) -> None:
+        self._timer.stop()
+        update, self._pending = self._pending, CanvasUpdate()
+        if not update:
+            return
+        self._since_flush.restart()
+        self.flushed.emit(update)
+
+    def _schedule(self) -> None:
+        if self._timer.isActive():
+            return
+        self._timer.start(max(0, self._interval_ms - self._since_flush.elapsed()))
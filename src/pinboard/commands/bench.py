@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from pinboard.models.note import Note
+from pinboard.storage import parse_cache
+from pinboard.storage.backend import load_notes, save_notes
+from pinboard.storage.sqlite_storage import SQLITE_SUFFIX
+from pinboard.storage.yaml_storage import Config, load_config
+from pinboard.synthetic import BoardSpec, generate_notes
+
+RESULTS_VERSION = 1
+VIEWPORT_SIZE = (1280, 800)
+PAINT_SIZE = (1920, 1080)
+PLACEMENT_CALLS = 200
+SELECT_CALLS = 2000
+
+Runs = dict[str, list[float]]
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def measure(fn: Callable[[], object], repeat: int, setup: Callable[[], object] | None = None) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        runs.append(timed(fn))
+    return runs
+
+
+def per_call(fn: Callable[[], object], calls: int, repeat: int = 1) -> list[float]:
+    return [seconds / calls for seconds in measure(lambda: [fn() for _ in range(calls)], repeat)]
+
+
+def _storage_runs(notes: list[Note], suffix: str, repeat: int) -> Runs:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"board{suffix}"
+        cache = parse_cache.cache_path(path)
+        runs = {"save_notes": measure(lambda: save_notes(path, notes), repeat)}
+        # The GUI open path, the only load that reads and writes the parse cache.
+        load = partial(load_notes, path, use_cache=True)
+        runs["load_notes"] = measure(load, repeat, setup=lambda: cache.unlink(missing_ok=True))
+        if suffix != SQLITE_SUFFIX:
+            runs["load_notes_cached"] = measure(load, repeat)
+        return runs
+
+
+def _canvas_runs(notes: list[Note], config: Config, repeat: int, seed: int) -> Runs:
+    # Always offscreen, so paint timings do not depend on the display a run happened to have.
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PySide6.QtCore import QRectF
+    from PySide6.QtGui import QImage, QPainter
+    from PySide6.QtWidgets import QApplication
+
+    from pinboard.undo_manager import UndoManager
+    from pinboard.widgets.canvas import PinboardCanvas
+
+    app = QApplication.instance() or QApplication([])
+    canvas = PinboardCanvas(config, UndoManager())
+    canvas.resize(*VIEWPORT_SIZE)
+    canvas.show()
+
+    runs: Runs = {"canvas_load_notes": [], "canvas_fully_loaded": []}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        canvas.load_notes(notes)
+        runs["canvas_load_notes"].append(time.perf_counter() - start)
+        while canvas.is_loading():
+            app.processEvents()
+        runs["canvas_fully_loaded"].append(time.perf_counter() - start)
+
+    runs["get_notes"] = measure(canvas.get_notes, repeat)
+    runs["select_next"] = per_call(canvas.select_next_note, SELECT_CALLS, repeat)
+
+    anchors = random.Random(seed).sample(canvas.note_ids(), min(PLACEMENT_CALLS, len(notes)))
+    placement = []
+    for _ in range(repeat):
+        total = 0.0
+        for note_id in anchors:
+            canvas.focus_note(note_id)
+            start = time.perf_counter()
+            canvas._calculate_position_smart()
+            total += time.perf_counter() - start
+        placement.append(total / max(1, len(anchors)))
+    runs["placement"] = placement
+
+    scene = canvas.scene()
+    source = scene.itemsBoundingRect()
+    image = QImage(*PAINT_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def paint_scene() -> None:
+        image.fill(0)
+        painter = QPainter(image)
+        scene.render(painter, QRectF(image.rect()), source)
+        painter.end()
+
+    runs["paint_scene"] = measure(paint_scene, repeat)
+    runs["paint_viewport"] = measure(canvas.viewport().grab, repeat)
+
+    canvas.close()
+    canvas.deleteLater()
+    app.processEvents()
+    return runs
+
+
+def _environment() -> dict:
+    import PySide6
+
+    return {"python": platform.python_version(), "qt": PySide6.__version__, "platform": platform.platform()}
+
+
+def run_benchmarks(spec: BoardSpec, suffix: str, repeat: int) -> dict:
+    # The default config, not the user's, so runs on different machines measure the same board.
+    config = load_config()
+    notes = generate_notes(spec, config.palette)
+    runs = _storage_runs(notes, suffix, repeat)
+    runs.update(_canvas_runs(notes, config, repeat, spec.seed))
+    return {
+        "version": RESULTS_VERSION,
+        "spec": asdict(spec),
+        "format": suffix,
+        "repeat": repeat,
+        "environment": _environment(),
+        "results": {
+            name: {"median": statistics.median(values), "min": min(values), "runs": values}
+            for name, values in runs.items()
+        },
+    }
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def print_results(results: dict) -> None:
+    for name, result in results["results"].items():
+        print(f"{name:>20} {_format_seconds(result['median']):>10} (min {_format_seconds(result['min'])})", file=sys.stderr)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    if baseline["spec"] != current["spec"] or baseline["format"] != current["format"]:
+        print("warning: baseline was measured on a different board", file=sys.stderr)
+    # Minimums, not medians: background load only ever adds time, so the fastest run is the least noisy.
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:>20} {'-':>10} -> {_format_seconds(result['min']):>10}  new", file=sys.stderr)
+            continue
+        change = result["min"] / before["min"] - 1 if before["min"] else 0.0
+        verdict = ""
+        if change > threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            verdict = "faster"
+        print(
+            f"{name:>20} {_format_seconds(before['min']):>10} -> {_format_seconds(result['min']):>10}"
+            f" {change:+8.1%}  {verdict}",
+            file=sys.stderr,
+        )
+    return regressions
+
+
+def _read_results(path: Path) -> dict:
+    with open(path) as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results in {path}")
+    return results
+
+
+def run(args: argparse.Namespace) -> None:
+    spec = BoardSpec(
+        notes=args.notes,
+        words=args.words,
+        text_distribution=args.text_distribution,
+        overlap=args.overlap,
+        colors=args.colors,
+        seed=args.seed,
+    )
+    if args.generate:
+        notes = generate_notes(spec, load_config().palette)
+        save_notes(args.generate, notes)
+        print(f"Wrote {len(notes)} notes to {args.generate}")
+        return
+
+    if args.compare and len(args.compare) == 2:
+        baseline, current = (_read_results(path) for path in args.compare)
+    else:
+        baseline = _read_results(args.compare[0]) if args.compare else None
+        suffix = SQLITE_SUFFIX if args.format == "sqlite" else ".yaml"
+        current = run_benchmarks(spec, suffix, args.repeat)
+        output = json.dumps(current, indent=2)
+        if args.output:
+            args.output.write_text(output + "\n")
+        else:
+            print(output)
+        if baseline is None:
+            print_results(current)
+
+    if baseline is not None and compare(baseline, current, args.threshold):
+        sys.exit(1)
@@ -1,42 +1,180 @@
 from __future__ import annotations
 
 import argparse
+import json
 import random
+import sys
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from pinboard.models.note import Note, utc_now
-from pinboard.storage.yaml_storage import load_config, load_notes, save_notes
+from pinboard.ipc import send_records
+from pinboard.models.note import Note, NoteChange, utc_now
+from pinboard.storage import sqlite_storage
+from pinboard.storage.backend import board_stamp, read_generation, save_changes, save_notes
+from pinboard.storage.locking import board_lock
+from pinboard.storage.sqlite_storage import is_sqlite_path
+from pinboard.storage.yaml_storage import Config, load_config, load_notes
 
+NUMERIC_FIELDS = ("x", "y", "width", "height")
 
-def run(args: argparse.Namespace) -> None:
-    user_config_path = Path.home() / ".config" / "pinboard" / "config.yaml"
-    config = load_config(user_config_path)
 
-    notes = load_notes(args.file)
+class _Board:
+    def __init__(self, filepath: Path, config: Config):
+        self._filepath = filepath
+        self._config = config
+        self._incremental = config.journal
+        self._version: tuple[str, int] | None = None
+        self._notes: list[Note] = []
+        self._last_note: Note | None = None
+        self._max_order = 0
+
+    def push(self, records: list[dict]) -> list[Note]:
+        if is_sqlite_path(self._filepath):
+            return sqlite_storage.append_notes(self._filepath, lambda last, order: self._make(records, last, order))
+        # The lock spans reading the last note through the write, so parallel pushes never reuse an id.
+        with board_lock(self._filepath):
+            if self._read_version() != self._version:
+                self._load()
+            created = self._make(records, self._last_note, self._max_order)
+            self._last_note, self._max_order = created[-1], created[-1].order
+            if self._incremental:
+                save_changes(self._filepath, [NoteChange(note_id=n.id, kinds={"create"}, note=n) for n in created])
+            else:
+                self._notes.extend(created)
+                save_notes(self._filepath, self._notes)
+            self._version = self._read_version()
+        return created
+
+    def _read_version(self) -> tuple[str, int]:
+        # mtime alone can miss a same-sized write within one clock tick; the generation cannot.
+        return board_stamp(str(self._filepath)), read_generation(self._filepath)
+
+    def _make(self, records: list[dict], last_note: Note | None, max_order: int) -> list[Note]:
+        created = []
+        for record in records:
+            last_note = make_note(self._config, last_note, max_order, record)
+            max_order = last_note.order
+            created.append(last_note)
+        return created
+
+    def _load(self) -> None:
+        self._notes = load_notes(self._filepath)
+        self._last_note = max(self._notes, key=lambda n: n.id, default=None)
+        self._max_order = max((n.order for n in self._notes), default=0)
 
-    if notes:
-        max_id = max(n.id for n in notes)
-        max_order = max(n.order for n in notes)
-        last_note = max(notes, key=lambda n: n.id)
+
+def make_note(config: Config, last_note: Note | None, max_order: int, record: dict) -> Note:
+    if last_note:
         x = last_note.x + last_note.width + config.padding
         y = last_note.y
     else:
-        max_id = 0
-        max_order = 0
         x = config.padding
         y = config.padding
 
-    note = Note(
-        id=max_id + 1,
-        x=x,
-        y=y,
-        width=config.default_width,
-        height=config.default_height,
-        text=args.text,
+    color = record.get("color")
+    return Note(
+        id=last_note.id + 1 if last_note else 1,
+        x=record.get("x", x),
+        y=record.get("y", y),
+        width=record.get("width", config.default_width),
+        height=record.get("height", config.default_height),
+        text=record["text"],
         order=max_order + 1,
-        color=random.choice(config.palette),
+        color=tuple(color) if color else random.choice(config.palette),
         created_at=utc_now(),
     )
-    notes.append(note)
-    save_notes(args.file, notes)
-    print(f"Added note {note.id} at ({x}, {y})")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_color(value) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) == 4
+        and all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in value)
+    )
+
+
+def parse_record(line: str, line_no: int) -> dict | None:
+    line = line.rstrip("\r\n")
+    if not line.strip():
+        return None
+    if not line.lstrip().startswith("{"):
+        return {"text": line}
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid note record on line {line_no}: {e}") from e
+    if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+        raise ValueError(f"Note record on line {line_no} needs a string 'text' field")
+    for field in NUMERIC_FIELDS:
+        if field in record and not _is_number(record[field]):
+            raise ValueError(f"Note record on line {line_no} needs a number for '{field}'")
+    if "color" in record and not _is_color(record["color"]):
+        raise ValueError(f"Note record on line {line_no} needs 'color' as four integers from 0 to 255")
+    return record
+
+
+def read_records(lines: Iterable[str]) -> Iterator[dict]:
+    for line_no, line in enumerate(lines, start=1):
+        record = parse_record(line, line_no)
+        if record is not None:
+            yield record
+
+
+def _batches(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    try:
+        for record in records:
+            batch.append(record)
+            if size and len(batch) >= size:
+                yield batch
+                batch = []
+    except ValueError:
+        # Notes read before a bad line are still written before the error is raised.
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+def _send(filepath: Path, records: list[dict]) -> list[dict] | None:
+    try:
+        return send_records(filepath, records)
+    except ConnectionError as e:
+        sys.exit(f"pinboard push: {e}")
+
+
+def run(args: argparse.Namespace) -> None:
+    user_config_path = Path.home() / ".config" / "pinboard" / "config.yaml"
+    config = load_config(user_config_path)
+
+    if not args.stdin:
+        replies = _send(args.file, [{"text": args.text}])
+        if replies is not None:
+            reply = replies[0]
+            if "error" in reply:
+                raise ValueError(reply["error"])
+            print(f"Added note {reply['id']} at ({reply['x']}, {reply['y']}) in running pinboard")
+            return
+        (note,) = _Board(args.file, config).push([{"text": args.text}])
+        print(f"Added note {note.id} at ({note.x}, {note.y})")
+        return
+
+    board = None
+    count = 0
+    for batch in _batches(read_records(sys.stdin), args.batch_size):
+        if board is None:
+            replies = _send(args.file, batch)
+            if replies is not None:
+                errors = [r["error"] for r in replies if "error" in r]
+                count += len(replies) - len(errors)
+                if errors:
+                    raise ValueError(errors[0])
+                continue
+            board = _Board(args.file, config)
+        count += len(board.push(batch))
+    print(f"Added {count} notes")
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from pinboard.storage.board_index import BoardIndex
+
+
+def _first_line(text: str) -> str:
+    return text.strip().split("\n", 1)[0]
+
+
+def run(args: argparse.Namespace) -> None:
+    if not args.directory.is_dir():
+        raise ValueError(f"Not a directory: {args.directory}")
+
+    index = BoardIndex(args.directory)
+    try:
+        _, errors = index.update(jobs=args.jobs)
+        for path, message in errors.items():
+            print(f"Skipped {path}: {message}", file=sys.stderr)
+        hits = index.search(args.query)
+    finally:
+        index.close()
+
+    for hit in hits:
+        print(f"{hit.path}:{hit.note_id}: {_first_line(hit.text)}")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from pinboard.coalescer import CanvasUpdate
+from pinboard.models.note_store import NoteStore
+from pinboard.search_index import SearchIndex
+
+if TYPE_CHECKING:
+    from pinboard.widgets.canvas import PinboardCanvas
+
+
+class BackgroundIndexer(QObject):
+    ready = Signal()
+    _built = Signal(object)  # (generation, SearchIndex, texts)
+
+    def __init__(self, canvas: PinboardCanvas, parent: QObject | None = None):
+        super().__init__(parent)
+        self._canvas = canvas
+        self._index = SearchIndex()
+        self._texts: dict[int, str] = {}
+        self._generation = 0
+        # Ids edited while a rebuild runs; applied once the new index arrives.
+        self._pending: set[int] | None = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._built.connect(self._on_built)
+
+    def is_building(self) -> bool:
+        return self._pending is not None
+
+    def search(self, query: str) -> list[int]:
+        return self._index.search(query)
+
+    def on_canvas_updated(self, update: CanvasUpdate) -> None:
+        if update.reloaded:
+            self.rebuild()
+        elif self._pending is not None:
+            self._pending |= update.note_ids
+        elif update.note_ids:
+            self._apply(update.note_ids)
+
+    def rebuild(self) -> None:
+        self._generation += 1
+        self._pending = set()
+        generation, store = self._generation, self._canvas.snapshot()
+        self._pool.start(lambda: self._build(generation, store))
+
+    def _build(self, generation: int, store: NoteStore) -> None:
+        texts = dict(zip(store.ids(), store.texts()))
+        self._built.emit((generation, SearchIndex.build(texts.items()), texts))
+
+    def _on_built(self, result: tuple[int, SearchIndex, dict[int, str]]) -> None:
+        generation, index, texts = result
+        if generation != self._generation:
+            return
+        self._index, self._texts = index, texts
+        pending, self._pending = self._pending, None
+        self._apply(pending)
+        self.ready.emit()
+
+    def _apply(self, note_ids: Iterable[int]) -> None:
+        for note_id in note_ids:
+            text = self._canvas.note_text(note_id)
+            if text is None:
+                if self._texts.pop(note_id, None) is not None:
+                    self._index.remove(note_id)
+            elif text != self._texts.get(note_id):
+                self._texts[note_id] = text
+                self._index.update(note_id, text)
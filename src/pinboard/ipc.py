@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import tempfile
+from pathlib import Path
+
+SEND_TIMEOUT_S = 5.0
+
+
+def socket_path(board_path: Path) -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    digest = hashlib.sha1(str(board_path.resolve()).encode()).hexdigest()[:16]
+    return Path(runtime_dir) / f"pinboard-{digest}.sock"
+
+
+def _connect(path: Path) -> socket.socket | None:
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(SEND_TIMEOUT_S)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def is_listening(path: Path) -> bool:
+    sock = _connect(path)
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def send_records(board_path: Path, records: list[dict]) -> list[dict] | None:
+    sock = _connect(socket_path(board_path))
+    if sock is None:
+        return None
+
+    payload = "".join(json.dumps(r) + "\n" for r in records) + "\n"
+    chunks = []
+    with sock:
+        try:
+            sock.sendall(payload.encode())
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except socket.timeout:
+            # Not retried against the file: the GUI may still add these notes once it catches up.
+            raise ConnectionError(
+                f"Running pinboard did not reply within {SEND_TIMEOUT_S:g}s; it may still add the notes when it is idle"
+            ) from None
+        except OSError as e:
+            raise ConnectionError(f"Lost the connection to running pinboard: {e}") from e
+    replies = [json.loads(line) for line in b"".join(chunks).splitlines() if line]
+    if len(replies) < len(records):
+        raise ConnectionError("Running pinboard closed the connection without replying")
+    return replies
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from pinboard.commands.push import make_note, parse_record
+from pinboard.ipc import is_listening, socket_path
+from pinboard.storage.yaml_storage import Config
+
+if TYPE_CHECKING:
+    from pinboard.widgets.canvas import PinboardCanvas
+
+
+class _PushConnection(QObject):
+    def __init__(self, socket: QLocalSocket, handler: Callable[[bytes], bytes], parent: QObject):
+        super().__init__(parent)
+        self._socket = socket
+        self._handler = handler
+        self._buffer = b""
+        self._handled = False
+        socket.readyRead.connect(self._on_ready_read)
+        socket.disconnected.connect(self._on_disconnected)
+
+    def _on_ready_read(self) -> None:
+        self._buffer += bytes(self._socket.readAll())
+        if self._handled or b"\n\n" not in self._buffer:
+            return
+        self._handled = True
+        request, _, _ = self._buffer.partition(b"\n\n")
+        self._socket.write(self._handler(request))
+        self._socket.flush()
+        self._socket.disconnectFromServer()
+
+    def _on_disconnected(self) -> None:
+        self._socket.deleteLater()
+        self.deleteLater()
+
+
+class PushServer(QObject):
+    notes_pushed = Signal(int)
+
+    def __init__(self, file_path: Path, canvas: PinboardCanvas, config: Config, parent: QObject | None = None):
+        super().__init__(parent)
+        self._path = socket_path(file_path)
+        self._canvas = canvas
+        self._config = config
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        if is_listening(self._path):
+            return False
+        QLocalServer.removeServer(str(self._path))
+        return self._server.listen(str(self._path))
+
+    def close(self) -> None:
+        if self._server.isListening():
+            self._server.close()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            _PushConnection(self._server.nextPendingConnection(), self._handle_request, self)
+
+    def _handle_request(self, request: bytes) -> bytes:
+        replies = []
+        pushed = 0
+        for line_no, line in enumerate(request.decode(errors="replace").splitlines(), start=1):
+            # One reply per record, errors included, so a bad record never leaves the client waiting.
+            try:
+                record = parse_record(line, line_no)
+                if record is None:
+                    continue
+                note = make_note(self._config, self._canvas.get_last_note(), self._canvas.get_max_order(), record)
+                item = self._canvas.add_note(note)
+            except Exception as e:
+                replies.append({"error": str(e)})
+                continue
+            replies.append({"id": item.note_id, "x": item.pos().x(), "y": item.pos().y()})
+            pushed += 1
+        if pushed:
+            self.notes_pushed.emit(pushed)
+        return "".join(json.dumps(r) + "\n" for r in replies).encode()
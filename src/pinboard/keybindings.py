@@ -52,6 +52,15 @@ def setup_keybindings(window: MainWindow) -> None:
     h_shortcut = QShortcut(QKeySequence("H"), window)
     h_shortcut.activated.connect(window.select_prev)
 
+    shift_j_shortcut = QShortcut(QKeySequence("Shift+J"), window)
+    shift_j_shortcut.activated.connect(window.extend_selection_next)
+
+    shift_k_shortcut = QShortcut(QKeySequence("Shift+K"), window)
+    shift_k_shortcut.activated.connect(window.extend_selection_prev)
+
+    select_all_shortcut = QShortcut(QKeySequence.StandardKey.SelectAll, window)
+    select_all_shortcut.activated.connect(window.select_all)
+
     shift_h_shortcut = QShortcut(QKeySequence("Shift+H"), window)
     shift_h_shortcut.activated.connect(window.show_text_overlay)
 
@@ -82,8 +91,20 @@ def setup_keybindings(window: MainWindow) -> None:
     edit_shortcut = QShortcut(QKeySequence("E"), window)
     edit_shortcut.activated.connect(window.edit)
 
+    search_shortcut = QShortcut(QKeySequence("/"), window)
+    search_shortcut.activated.connect(window.open_search)
+
+    next_result_shortcut = QShortcut(QKeySequence("N"), window)
+    next_result_shortcut.activated.connect(window.next_search_result)
+
+    prev_result_shortcut = QShortcut(QKeySequence("Shift+N"), window)
+    prev_result_shortcut.activated.connect(window.prev_search_result)
+
     esc_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Escape), window)
     esc_shortcut.activated.connect(window.escape)
 
     backspace_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Backspace), window)
     backspace_shortcut.activated.connect(window.reset_viewport)
+
+    perf_hud_shortcut = QShortcut(QKeySequence(Qt.Key.Key_F12), window)
+    perf_hud_shortcut.activated.connect(window.toggle_perf_hud)
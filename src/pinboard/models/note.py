@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -54,3 +56,10 @@ class Note:
             edited_at=data.get("edited_at"),
             adjusted_at=data.get("adjusted_at"),
         )
+
+
+@dataclass
+class NoteChange:
+    note_id: int
+    kinds: set[str]
+    note: Note | None = None
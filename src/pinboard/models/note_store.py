@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator
+
+from pinboard.models.note import Note
+
+Color = tuple[int, int, int, int]
+
+
+def pack_color(color: Color) -> int:
+    r, g, b, a = color
+    return (r << 24) | (g << 16) | (b << 8) | a
+
+
+def unpack_color(packed: int) -> Color:
+    return (packed >> 24) & 0xFF, (packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF
+
+
+class NoteView:
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store: NoteStore, note_id: int):
+        self._store = store
+        self.id = note_id
+
+    @property
+    def _row(self) -> int:
+        return self._store._rows[self.id]
+
+    @property
+    def x(self) -> float:
+        return self._store._x[self._row]
+
+    @property
+    def y(self) -> float:
+        return self._store._y[self._row]
+
+    @property
+    def width(self) -> float:
+        return self._store._width[self._row]
+
+    @property
+    def height(self) -> float:
+        return self._store._height[self._row]
+
+    @property
+    def order(self) -> int:
+        return self._store._order[self._row]
+
+    @property
+    def color(self) -> Color:
+        return unpack_color(self._store._color[self._row])
+
+    @property
+    def text(self) -> str:
+        return self._store._text[self._row]
+
+    @property
+    def created_at(self) -> str | None:
+        return self._store._created_at[self._row]
+
+    @property
+    def edited_at(self) -> str | None:
+        return self._store._edited_at[self._row]
+
+    @property
+    def adjusted_at(self) -> str | None:
+        return self._store._adjusted_at[self._row]
+
+
+class NoteStore:
+    def __init__(self, notes: Iterable[Note] = ()):
+        self._rows: dict[int, int] = {}
+        self._ids = array("q")
+        self._x = array("d")
+        self._y = array("d")
+        self._width = array("d")
+        self._height = array("d")
+        self._order = array("q")
+        self._color = array("L")
+        self._text: list[str] = []
+        self._created_at: list[str | None] = []
+        self._edited_at: list[str | None] = []
+        self._adjusted_at: list[str | None] = []
+        for note in notes:
+            self.put(note)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, note_id: int) -> bool:
+        return note_id in self._rows
+
+    def __iter__(self) -> Iterator[Note]:
+        return iter(self.to_notes())
+
+    def _columns(self) -> tuple[array, ...]:
+        return self._ids, self._x, self._y, self._width, self._height, self._order, self._color
+
+    def _tables(self) -> tuple[list, ...]:
+        return self._text, self._created_at, self._edited_at, self._adjusted_at
+
+    def put(self, note: Note) -> None:
+        # Convert every value before touching a column, so a bad note raises without a half-written row.
+        try:
+            r, g, b, a = note.color
+            invalid = (r | g | b | a) >> 8  # any channel negative or above 255
+        except (TypeError, ValueError):
+            invalid = True
+        if invalid:
+            raise ValueError(f"Invalid color for note {note.id}: {note.color!r}")
+        values = (
+            int(note.id),
+            float(note.x),
+            float(note.y),
+            float(note.width),
+            float(note.height),
+            int(note.order),
+            (r << 24) | (g << 16) | (b << 8) | a,
+        )
+        side = (note.text, note.created_at, note.edited_at, note.adjusted_at)
+        row = self._rows.get(note.id)
+        if row is None:
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+            for table, value in zip(self._tables(), side):
+                table.append(value)
+            self._rows[note.id] = len(self._ids) - 1
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+            for table, value in zip(self._tables(), side):
+                table[row] = value
+
+    def remove(self, note_id: int) -> None:
+        row = self._rows.pop(note_id, None)
+        if row is None:
+            return
+        # Move the last row into the hole so the columns stay dense.
+        last = len(self._ids) - 1
+        if row != last:
+            self._rows[self._ids[last]] = row
+            for column in self._columns() + self._tables():
+                column[row] = column[last]
+        for column in self._columns() + self._tables():
+            column.pop()
+
+    def get(self, note_id: int) -> Note | None:
+        row = self._rows.get(note_id)
+        return None if row is None else self._note_at(row)
+
+    def view(self, note_id: int) -> NoteView | None:
+        return NoteView(self, note_id) if note_id in self._rows else None
+
+    def rect(self, note_id: int) -> tuple[float, float, float, float] | None:
+        row = self._rows.get(note_id)
+        if row is None:
+            return None
+        return self._x[row], self._y[row], self._width[row], self._height[row]
+
+    def color(self, note_id: int) -> Color | None:
+        row = self._rows.get(note_id)
+        return None if row is None else unpack_color(self._color[row])
+
+    def ids(self) -> array:
+        return self._ids
+
+    def texts(self) -> list[str]:
+        return self._text
+
+    def _note_at(self, row: int) -> Note:
+        return Note(
+            id=self._ids[row],
+            x=self._x[row],
+            y=self._y[row],
+            width=self._width[row],
+            height=self._height[row],
+            text=self._text[row],
+            order=self._order[row],
+            color=unpack_color(self._color[row]),
+            created_at=self._created_at[row],
+            edited_at=self._edited_at[row],
+            adjusted_at=self._adjusted_at[row],
+        )
+
+    def copy(self) -> NoteStore:
+        store = NoteStore()
+        store._rows = dict(self._rows)
+        store._ids, store._x, store._y, store._width, store._height, store._order, store._color = (
+            column[:] for column in self._columns()
+        )
+        store._text, store._created_at, store._edited_at, store._adjusted_at = (table[:] for table in self._tables())
+        return store
+
+    def to_notes(self) -> list[Note]:
+        return [
+            Note(
+                id=note_id,
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                text=text,
+                order=order,
+                color=unpack_color(color),
+                created_at=created_at,
+                edited_at=edited_at,
+                adjusted_at=adjusted_at,
+            )
+            for note_id, x, y, width, height, order, color, text, created_at, edited_at, adjusted_at in zip(
+                *self._columns(), *self._tables()
+            )
+        ]
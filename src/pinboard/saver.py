@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Iterable
+
+from PySide6.QtCore import QObject, QThreadPool, Signal
+
+from pinboard.models.note import Note, NoteChange
+from pinboard.storage.backend import board_stamp, save_changes, save_merged, save_notes
+
+
+class BackgroundSaver(QObject):
+    saved = Signal(float)  # duration in seconds
+    written = Signal(str)  # board stamp taken right after the write
+    failed = Signal(str)
+    _job_done = Signal()
+
+    def __init__(self, file_path: Path, parent: QObject | None = None):
+        super().__init__(parent)
+        self._file_path = file_path
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pending_notes: Iterable[Note] | None = None
+        self._pending_ids: set[int] = set()
+        self._pending_changes: list[NoteChange] = []
+        # Generation of the board our snapshot is based on; None skips the concurrent-writer check.
+        self._generation: int | None = None
+        self._running = False
+        self._job_done.connect(self._on_job_done)
+
+    def set_generation(self, generation: int) -> None:
+        self._generation = generation
+
+    def save(self, notes: Iterable[Note], changed_ids: Iterable[int] = ()) -> None:
+        self._pending_notes = notes
+        self._pending_ids.update(changed_ids)
+        self._pending_changes = []
+        self._start_pending()
+
+    def save_changes(self, changes: list[NoteChange]) -> None:
+        self._pending_changes.extend(changes)
+        self._start_pending()
+
+    def flush(self, notes: Iterable[Note], changed_ids: Iterable[int] = ()) -> None:
+        # Queued journal changes never reached the file, so the snapshot must carry them through a merge.
+        changed_ids = self._pending_ids.union(changed_ids, (c.note_id for c in self._pending_changes))
+        self._pending_notes = None
+        self._pending_ids = set()
+        self._pending_changes = []
+        self._pool.waitForDone()
+        self._running = False
+        self._save_snapshot(notes, changed_ids)
+
+    def flush_changes(self, changes: list[NoteChange]) -> None:
+        self._pool.waitForDone()
+        self._running = False
+        if self._pending_notes is not None:
+            save_notes(self._file_path, self._pending_notes)
+        pending = self._pending_changes + changes
+        self._pending_notes, self._pending_changes = None, []
+        save_changes(self._file_path, pending)
+
+    def is_busy(self) -> bool:
+        return self._running
+
+    def _start_pending(self) -> None:
+        if self._running:
+            return
+        if self._pending_notes is None and not self._pending_changes:
+            return
+        notes, changed_ids, changes = self._pending_notes, self._pending_ids, self._pending_changes
+        self._pending_notes, self._pending_ids, self._pending_changes = None, set(), []
+        self._running = True
+        self._pool.start(lambda: self._write(notes, changed_ids, changes))
+
+    def _save_snapshot(self, notes: Iterable[Note], changed_ids: set[int]) -> bool:
+        if self._generation is None:
+            save_notes(self._file_path, notes)
+            return False
+        generation, merged = save_merged(self._file_path, notes, changed_ids, self._generation)
+        if not merged:
+            self._generation = generation
+        return merged
+
+    def _write(self, notes: Iterable[Note] | None, changed_ids: set[int], changes: list[NoteChange]) -> None:
+        start = time.perf_counter()
+        try:
+            merged = notes is not None and self._save_snapshot(notes, changed_ids)
+            if changes:
+                save_changes(self._file_path, changes)
+            if not merged:
+                # After a merge the file holds notes the canvas lacks; let the watcher reload it.
+                self.written.emit(board_stamp(str(self._file_path)))
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.saved.emit(time.perf_counter() - start)
+        finally:
+            self._job_done.emit()
+
+    def _on_job_done(self) -> None:
+        self._running = False
+        self._start_pending()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Iterable
+
+MIN_PREFIX_LENGTH = 2
+FUZZY_MIN_LENGTH = 4
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _deletions(term: str) -> set[str]:
+    return {term[:i] + term[i + 1 :] for i in range(len(term))}
+
+
+class SearchIndex:
+    # Inverted index from lowercased words to note ids. Prefix matches come from a sorted term list;
+    # fuzzy matches (one edit away) come from a map of each term's single-character deletions, so a
+    # query never scans the vocabulary.
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+        self._note_terms: dict[int, frozenset[str]] = {}
+        self._terms: list[str] = []
+        self._deletes: dict[str, set[str]] = {}
+
+    @classmethod
+    def build(cls, texts: Iterable[tuple[int, str]]) -> SearchIndex:
+        index = cls()
+        postings = index._postings
+        for note_id, text in texts:
+            terms = frozenset(tokenize(text))
+            if not terms:
+                continue
+            index._note_terms[note_id] = terms
+            for term in terms:
+                ids = postings.get(term)
+                if ids is None:
+                    postings[term] = {note_id}
+                else:
+                    ids.add(note_id)
+        index._terms = sorted(postings)
+        for term in index._terms:
+            index._add_deletions(term)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._note_terms)
+
+    def __contains__(self, note_id: int) -> bool:
+        return note_id in self._note_terms
+
+    def update(self, note_id: int, text: str) -> None:
+        terms = frozenset(tokenize(text))
+        old = self._note_terms.get(note_id, frozenset())
+        if terms == old:
+            return
+        for term in old - terms:
+            self._unpost(term, note_id)
+        for term in terms - old:
+            self._post(term, note_id)
+        if terms:
+            self._note_terms[note_id] = terms
+        else:
+            del self._note_terms[note_id]
+
+    def remove(self, note_id: int) -> None:
+        self.update(note_id, "")
+
+    def search(self, query: str) -> list[int]:
+        words = tokenize(query)
+        if not words:
+            return []
+        # Typo tolerance is a fallback: a word only matches fuzzily when nothing starts with it.
+        hits = [self._prefix_ids(word) or self._fuzzy_ids(word) for word in set(words)]
+        hits.sort(key=len)
+        return sorted(hits[0].intersection(*hits[1:]))
+
+    def _prefix_ids(self, word: str) -> set[int]:
+        # May return a posting set itself; callers must not mutate the result.
+        postings = self._postings
+        if len(word) < MIN_PREFIX_LENGTH:
+            return postings.get(word, set())
+        terms = self._terms
+        start = bisect.bisect_left(terms, word)
+        end = bisect.bisect_left(terms, word + "\U0010ffff", start)
+        if end - start == 1:
+            return postings[terms[start]]
+        return set().union(*(postings[term] for term in terms[start:end]))
+
+    def _fuzzy_ids(self, word: str) -> set[int]:
+        if len(word) < FUZZY_MIN_LENGTH:
+            return set()
+        postings = self._postings
+        deletes = self._deletes
+        candidates = set(deletes.get(word, ()))
+        for deleted in _deletions(word):
+            if deleted in postings:
+                candidates.add(deleted)
+            candidates.update(deletes.get(deleted, ()))
+        return set().union(*(postings[term] for term in candidates))
+
+    def _add_deletions(self, term: str) -> None:
+        if len(term) < FUZZY_MIN_LENGTH:
+            return
+        for deleted in _deletions(term):
+            terms = self._deletes.get(deleted)
+            if terms is None:
+                self._deletes[deleted] = {term}
+            else:
+                terms.add(term)
+
+    def _remove_deletions(self, term: str) -> None:
+        if len(term) < FUZZY_MIN_LENGTH:
+            return
+        for deleted in _deletions(term):
+            terms = self._deletes.get(deleted)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[deleted]
+
+    def _post(self, term: str, note_id: int) -> None:
+        ids = self._postings.get(term)
+        if ids is not None:
+            ids.add(note_id)
+            return
+        self._postings[term] = {note_id}
+        bisect.insort(self._terms, term)
+        self._add_deletions(term)
+
+    def _unpost(self, term: str, note_id: int) -> None:
+        ids = self._postings.get(term)
+        if ids is None:
+            return
+        ids.discard(note_id)
+        if ids:
+            return
+        del self._postings[term]
+        del self._terms[bisect.bisect_left(self._terms, term)]
+        self._remove_deletions(term)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+from typing import Iterator
+
+DEFAULT_CELL_SIZE = 512
+MAX_SLOT_STEPS = 10000
+
+Rect = tuple[float, float, float, float]  # x, y, width, height
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class SpatialIndex:
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self._cell_size = cell_size
+        self._rects: dict[int, Rect] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._columns: dict[int, set[int]] = {}
+        self._rows: dict[int, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._rects
+
+    def clear(self) -> None:
+        self._rects.clear()
+        self._cells.clear()
+        self._columns.clear()
+        self._rows.clear()
+
+    def _span(self, start: float, length: float) -> range:
+        first = math.floor(start / self._cell_size)
+        last = math.floor((start + max(length, 0)) / self._cell_size)
+        return range(first, last + 1)
+
+    def _cells_for(self, rect: Rect) -> Iterator[tuple[int, int]]:
+        x, y, w, h = rect
+        rows = self._span(y, h)
+        for col in self._span(x, w):
+            for row in rows:
+                yield col, row
+
+    def insert(self, key: int, x: float, y: float, width: float, height: float) -> None:
+        if key in self._rects:
+            self.remove(key)
+        self._rects[key] = (x, y, width, height)
+        cells = self._cells
+        rows = self._span(y, height)
+        for col in self._span(x, width):
+            self._columns.setdefault(col, set()).add(key)
+            for row in rows:
+                cells.setdefault((col, row), set()).add(key)
+        for row in rows:
+            self._rows.setdefault(row, set()).add(key)
+
+    def remove(self, key: int) -> None:
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        for cell in self._cells_for(rect):
+            self._discard(self._cells, cell, key)
+        for col in self._span(rect[0], rect[2]):
+            self._discard(self._columns, col, key)
+        for row in self._span(rect[1], rect[3]):
+            self._discard(self._rows, row, key)
+
+    def update(self, key: int, x: float, y: float, width: float, height: float) -> None:
+        if self._rects.get(key) != (x, y, width, height):
+            self.insert(key, x, y, width, height)
+
+    @staticmethod
+    def _discard(buckets: dict, bucket, key: int) -> None:
+        members = buckets.get(bucket)
+        if members is None:
+            return
+        members.discard(key)
+        if not members:
+            del buckets[bucket]
+
+    def rect(self, key: int) -> Rect | None:
+        return self._rects.get(key)
+
+    def query(self, x: float, y: float, width: float, height: float) -> set[int]:
+        area = (x, y, width, height)
+        found: set[int] = set()
+        for cell in self._cells_for(area):
+            members = self._cells.get(cell)
+            if members:
+                found.update(members)
+        return {key for key in found if _intersects(self._rects[key], area)}
+
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        if not self._rects:
+            return None
+        min_col = min(self._columns)
+        max_col = max(self._columns)
+        min_row = min(self._rows)
+        max_row = max(self._rows)
+        rects = self._rects
+        return (
+            min(rects[k][0] for k in self._columns[min_col]),
+            min(rects[k][1] for k in self._rows[min_row]),
+            max(rects[k][0] + rects[k][2] for k in self._columns[max_col]),
+            max(rects[k][1] + rects[k][3] for k in self._rows[max_row]),
+        )
+
+    def find_free_slot(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        padding: float,
+        direction: str = "right",
+    ) -> tuple[float, float]:
+        for _ in range(MAX_SLOT_STEPS):
+            hits = self.query(x - padding, y - padding, width + 2 * padding, height + 2 * padding)
+            if not hits:
+                break
+            if direction == "right":
+                x = max(self._rects[k][0] + self._rects[k][2] for k in hits) + padding
+            elif direction == "below":
+                y = max(self._rects[k][1] + self._rects[k][3] for k in hits) + padding
+            else:
+                raise ValueError(f"Unknown direction: {direction}")
+        return x, y
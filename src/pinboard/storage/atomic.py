@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+
+def _read_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def _target_mode(filepath: Path) -> int:
+    try:
+        return stat.S_IMODE(filepath.stat().st_mode)
+    except FileNotFoundError:
+        return DEFAULT_FILE_MODE
+
+
+@contextmanager
+def atomic_write(filepath: Path, mode: str = "w") -> Iterator[IO]:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{filepath.name}.", suffix=".tmp", dir=filepath.parent)
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, _target_mode(filepath))
+        os.replace(tmp_name, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+from pinboard.models.note import Note, NoteChange
+from pinboard.storage import sqlite_storage, yaml_storage
+from pinboard.storage.journal import JOURNAL_SUFFIX
+from pinboard.storage.sqlite_storage import SQLITE_SUFFIX, is_sqlite_path
+
+
+def load_notes(filepath: Path, use_cache: bool = False) -> list[Note]:
+    if is_sqlite_path(filepath):
+        return sqlite_storage.load_notes(filepath)
+    return yaml_storage.load_notes(filepath, use_cache)
+
+
+def save_notes(filepath: Path, notes: Iterable[Note]) -> None:
+    if is_sqlite_path(filepath):
+        sqlite_storage.save_notes(filepath, notes)
+    else:
+        yaml_storage.save_notes(filepath, notes)
+
+
+def read_generation(filepath: Path) -> int:
+    if is_sqlite_path(filepath):
+        return 0
+    return yaml_storage.read_generation(filepath)
+
+
+def save_merged(
+    filepath: Path, notes: Iterable[Note], changed_ids: set[int], base_generation: int
+) -> tuple[int, bool]:
+    if is_sqlite_path(filepath):
+        sqlite_storage.save_notes(filepath, notes)
+        return 0, False
+    return yaml_storage.save_merged(filepath, notes, changed_ids, base_generation)
+
+
+def save_changes(filepath: Path, changes: list[NoteChange]) -> None:
+    if is_sqlite_path(filepath):
+        sqlite_storage.save_changes(filepath, changes)
+    else:
+        yaml_storage.save_changes(filepath, changes)
+
+
+def _board_files(filepath: str) -> tuple[str, str]:
+    # The board and the file its pending writes go to.
+    return filepath, filepath + "-wal" if filepath.endswith(SQLITE_SUFFIX) else filepath + JOURNAL_SUFFIX
+
+
+def board_stamp(filepath: str) -> str:
+    # Size and mtime of the board and its companion file; any edit changes one of them.
+    # An empty companion counts as missing: a read-only sqlite load leaves an empty -wal behind.
+    board, companion = _board_files(filepath)
+    stamp = []
+    for path in (board, companion):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stamp.append(None)
+        else:
+            stamp.append([stat.st_size, stat.st_mtime_ns] if stat.st_size or path == board else None)
+    return json.dumps(stamp)
+
+
+def board_size(filepath: str) -> int:
+    size = 0
+    for path in _board_files(filepath):
+        try:
+            size += os.path.getsize(path)
+        except OSError:
+            pass
+    return size
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import string
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from pinboard.search_index import FUZZY_MIN_LENGTH, MIN_PREFIX_LENGTH, tokenize
+from pinboard.storage.backend import board_stamp, load_notes
+from pinboard.storage.sqlite_storage import SQLITE_SUFFIX
+
+INDEX_FILENAME = ".pinboard-search.db"
+INDEX_VERSION = 1
+BOARD_SUFFIXES = (".yaml", ".yml", SQLITE_SUFFIX)
+EDIT_ALPHABET = string.ascii_lowercase + string.digits
+MAX_QUERY_VARIABLES = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    stamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    board INTEGER NOT NULL,
+    note_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (board, note_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    board INTEGER NOT NULL,
+    note_id INTEGER NOT NULL,
+    PRIMARY KEY (term, board, note_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS terms_board ON terms (board);
+"""
+
+Hit = tuple[int, int]  # board row id, note id
+
+
+@dataclass
+class BoardHit:
+    path: Path
+    note_id: int
+    text: str
+
+
+def index_path(directory: Path) -> Path:
+    return directory / INDEX_FILENAME
+
+
+def find_boards(directory: Path) -> Iterator[str]:
+    # Board paths relative to directory. Hidden files and directories are skipped; the index is one.
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+        prefix = os.path.relpath(root, directory)
+        for name in sorted(files):
+            if not name.startswith(".") and name.endswith(BOARD_SUFFIXES):
+                yield name if prefix == os.curdir else os.path.join(prefix, name)
+
+
+def _read_board(path: Path) -> tuple[list[tuple[int, str, set[str]]] | None, str | None]:
+    # Read-only sqlite opens and no parse cache, so indexing never writes beside a board.
+    try:
+        notes = load_notes(path, use_cache=False)
+    except Exception as e:
+        return None, str(e)
+    return [(note.id, note.text, set(tokenize(note.text))) for note in notes], None
+
+
+def _edits(word: str) -> set[str]:
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    deletes = {left + right[1:] for left, right in splits if right}
+    transposes = {left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1}
+    replaces = {left + c + right[1:] for left, right in splits if right for c in EDIT_ALPHABET}
+    inserts = {left + c + right for left, right in splits for c in EDIT_ALPHABET}
+    return deletes | transposes | replaces | inserts
+
+
+def _chunks(values: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class BoardIndex:
+    # On-disk inverted index over every board below a directory. Each board row keeps the stamp it
+    # was indexed at, so an update only re-reads boards whose files changed since.
+
+    def __init__(self, directory: Path):
+        self._directory = directory
+        self._conn = sqlite3.connect(index_path(directory))
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != INDEX_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS boards; DROP TABLE IF EXISTS notes; DROP TABLE IF EXISTS terms;"
+            )
+            self._conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def update(self, jobs: int | None = None) -> tuple[int, dict[Path, str]]:
+        current = {path: board_stamp(os.path.join(self._directory, path)) for path in find_boards(self._directory)}
+        rows = self._conn.execute("SELECT id, path, stamp FROM boards")
+        indexed = {path: (board, stamp) for board, path, stamp in rows}
+        removed = [board for path, (board, _) in indexed.items() if path not in current]
+        changed = [path for path, stamp in current.items() if path not in indexed or indexed[path][1] != stamp]
+
+        errors: dict[Path, str] = {}
+        with self._conn:
+            for board in removed:
+                self._delete_board(board)
+            for path, (notes, error) in zip(changed, self._read_boards(changed, jobs)):
+                if notes is None:
+                    errors[self._directory / path] = error
+                else:
+                    self._store_board(path, current[path], notes)
+        return len(changed) - len(errors), errors
+
+    def search(self, query: str) -> list[BoardHit]:
+        words = set(tokenize(query))
+        if not words:
+            return []
+        matched: set[Hit] | None = None
+        for word in sorted(words, key=len, reverse=True):
+            hits = self._prefix_hits(word) or self._fuzzy_hits(word)
+            matched = hits if matched is None else matched & hits
+            if not matched:
+                return []
+        paths = dict(self._conn.execute("SELECT id, path FROM boards"))
+        results = []
+        for board, note_id in sorted(matched, key=lambda hit: (paths[hit[0]], hit[1])):
+            (text,) = self._conn.execute(
+                "SELECT text FROM notes WHERE board = ? AND note_id = ?", (board, note_id)
+            ).fetchone()
+            results.append(BoardHit(self._directory / paths[board], note_id, text))
+        return results
+
+    def _read_boards(self, paths: list[str], jobs: int | None) -> Iterable[tuple]:
+        files = [self._directory / path for path in paths]
+        if len(files) <= 1 or jobs == 1:
+            return map(_read_board, files)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_read_board, files, chunksize=max(1, len(files) // 64)))
+
+    def _delete_board(self, board: int) -> None:
+        self._conn.execute("DELETE FROM terms WHERE board = ?", (board,))
+        self._conn.execute("DELETE FROM notes WHERE board = ?", (board,))
+        self._conn.execute("DELETE FROM boards WHERE id = ?", (board,))
+
+    def _store_board(self, path: str, stamp: str, notes: list[tuple[int, str, set[str]]]) -> None:
+        row = self._conn.execute("SELECT id FROM boards WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            board = self._conn.execute("INSERT INTO boards (path, stamp) VALUES (?, ?)", (path, stamp)).lastrowid
+        else:
+            (board,) = row
+            self._conn.execute("DELETE FROM terms WHERE board = ?", (board,))
+            self._conn.execute("DELETE FROM notes WHERE board = ?", (board,))
+            self._conn.execute("UPDATE boards SET stamp = ? WHERE id = ?", (stamp, board))
+        self._conn.executemany(
+            "INSERT INTO notes (board, note_id, text) VALUES (?, ?, ?)",
+            ((board, note_id, text) for note_id, text, _ in notes),
+        )
+        self._conn.executemany(
+            "INSERT INTO terms (term, board, note_id) VALUES (?, ?, ?)",
+            ((term, board, note_id) for note_id, _, terms in notes for term in terms),
+        )
+
+    def _prefix_hits(self, word: str) -> set[Hit]:
+        if len(word) < MIN_PREFIX_LENGTH:
+            rows = self._conn.execute("SELECT board, note_id FROM terms WHERE term = ?", (word,))
+        else:
+            rows = self._conn.execute(
+                "SELECT board, note_id FROM terms WHERE term >= ? AND term < ?", (word, word + "\U0010ffff")
+            )
+        return set(rows)
+
+    def _fuzzy_hits(self, word: str) -> set[Hit]:
+        # The index has no deletion map, so probe every spelling one edit away instead.
+        if len(word) < FUZZY_MIN_LENGTH:
+            return set()
+        hits: set[Hit] = set()
+        for chunk in _chunks(sorted(_edits(word)), MAX_QUERY_VARIABLES):
+            placeholders = ", ".join("?" * len(chunk))
+            hits.update(self._conn.execute(f"SELECT board, note_id FROM terms WHERE term IN ({placeholders})", chunk))
+        return hits
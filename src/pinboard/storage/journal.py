@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from pinboard.models.note import Note, NoteChange
+
+JOURNAL_SUFFIX = ".journal"
+
+CHANGE_FIELDS = {
+    "move": ("x", "y", "adjusted_at"),
+    "resize": ("width", "height", "adjusted_at"),
+    "text": ("text", "edited_at"),
+    "color": ("color", "adjusted_at"),
+    "order": ("order", "adjusted_at"),
+}
+
+
+def journal_path(filepath: Path) -> Path:
+    return filepath.with_name(filepath.name + JOURNAL_SUFFIX)
+
+
+def records_for_change(change: NoteChange) -> list[dict]:
+    if change.note is None:
+        return [{"op": "delete", "id": change.note_id}]
+    if "create" in change.kinds:
+        return [{"op": "create", "note": change.note.to_dict()}]
+
+    records = []
+    for kind, fields in CHANGE_FIELDS.items():
+        if kind not in change.kinds:
+            continue
+        record = {"op": kind, "id": change.note_id}
+        for name in fields:
+            value = getattr(change.note, name)
+            record[name] = list(value) if name == "color" else value
+        records.append(record)
+    return records
+
+
+def append_records(filepath: Path, records: list[dict]) -> int:
+    lines = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+    with open(journal_path(filepath), "ab+") as f:
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                lines = "\n" + lines
+        f.write(lines.encode())
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def apply_record(notes: dict[int, Note], record: dict) -> None:
+    op = record["op"]
+    if op == "create":
+        note = Note.from_dict(record["note"])
+        notes[note.id] = note
+        return
+    if op == "delete":
+        notes.pop(record["id"], None)
+        return
+
+    note = notes.get(record["id"])
+    if note is None:
+        return
+    for name in CHANGE_FIELDS[op]:
+        value = record.get(name)
+        setattr(note, name, tuple(value) if name == "color" else value)
+
+
+def replay(filepath: Path, notes: list[Note]) -> list[Note]:
+    path = journal_path(filepath)
+    if not path.exists():
+        return notes
+
+    by_id = {n.id: n for n in notes}
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            apply_record(by_id, record)
+    return list(by_id.values())
+
+
+def clear(filepath: Path) -> None:
+    try:
+        os.unlink(journal_path(filepath))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic renames
+    fcntl = None
+
+_held = threading.local()
+
+
+def lock_path(filepath: Path) -> Path:
+    # A sidecar file, because atomic writes replace the board's inode on every save.
+    return filepath.with_name(f".{filepath.name}.lock")
+
+
+@contextmanager
+def board_lock(filepath: Path) -> Iterator[None]:
+    # Exclusive across processes and threads, re-entrant within a thread.
+    key = os.path.abspath(filepath)
+    depths = _held.__dict__.setdefault("depths", {})
+    if fcntl is None or depths.get(key):
+        depths[key] = depths.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            depths[key] -= 1
+        return
+
+    with open(lock_path(filepath), "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        depths[key] = 1
+        try:
+            yield
+        finally:
+            depths[key] = 0
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from pinboard.models.note import Note
+from pinboard.storage.atomic import atomic_write
+
+CACHE_VERSION = 1
+
+
+def cache_path(filepath: Path) -> Path:
+    return filepath.with_name(f".{filepath.name}.cache")
+
+
+def _key(stat: os.stat_result, raw: bytes) -> dict:
+    return {
+        "version": CACHE_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": hashlib.blake2b(raw, digest_size=16).hexdigest(),
+    }
+
+
+def _to_row(note: Note) -> list:
+    return [
+        note.id,
+        note.x,
+        note.y,
+        note.width,
+        note.height,
+        note.text,
+        note.order,
+        list(note.color),
+        note.created_at,
+        note.edited_at,
+        note.adjusted_at,
+    ]
+
+
+def _from_row(row: list) -> Note:
+    note_id, x, y, width, height, text, order, color, created_at, edited_at, adjusted_at = row
+    return Note(
+        id=note_id,
+        x=x,
+        y=y,
+        width=width,
+        height=height,
+        text=text,
+        order=order,
+        color=tuple(color),
+        created_at=created_at,
+        edited_at=edited_at,
+        adjusted_at=adjusted_at,
+    )
+
+
+def load(filepath: Path, stat: os.stat_result, raw: bytes) -> list[Note] | None:
+    path = cache_path(filepath)
+    try:
+        with open(path, "r") as f:
+            header = json.loads(f.readline())
+            if header != _key(stat, raw):
+                return None
+            rows = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    return [_from_row(row) for row in rows]
+
+
+def store(filepath: Path, stat: os.stat_result, raw: bytes, notes: list[Note]) -> None:
+    try:
+        with atomic_write(cache_path(filepath)) as f:
+            f.write(json.dumps(_key(stat, raw)) + "\n")
+            f.write(json.dumps([_to_row(n) for n in notes], separators=(",", ":")) + "\n")
+    except OSError:
+        pass
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable
+
+from pinboard.models.note import Note, NoteChange
+from pinboard.models.note_store import pack_color, unpack_color
+
+# Specific enough that an unrelated SQLite database is never mistaken for a board.
+SQLITE_SUFFIX = ".pinboard.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    width REAL NOT NULL,
+    height REAL NOT NULL,
+    text TEXT NOT NULL,
+    "order" INTEGER NOT NULL,
+    color INTEGER NOT NULL,
+    created_at TEXT,
+    edited_at TEXT,
+    adjusted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS notes_order ON notes ("order");
+"""
+
+COLUMNS = 'id, x, y, width, height, text, "order", color, created_at, edited_at, adjusted_at'
+UPSERT = f"INSERT OR REPLACE INTO notes ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def is_sqlite_path(filepath: Path) -> bool:
+    return filepath.name.endswith(SQLITE_SUFFIX)
+
+
+def _connect(filepath: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(filepath)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _connect_readonly(filepath: Path) -> sqlite3.Connection:
+    # Loads must never write: no schema, no journal mode switch.
+    return sqlite3.connect(f"{filepath.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def _to_row(note: Note) -> tuple:
+    return (
+        note.id,
+        note.x,
+        note.y,
+        note.width,
+        note.height,
+        note.text,
+        note.order,
+        pack_color(note.color),
+        note.created_at,
+        note.edited_at,
+        note.adjusted_at,
+    )
+
+
+def _from_row(row: tuple) -> Note:
+    note_id, x, y, width, height, text, order, color, created_at, edited_at, adjusted_at = row
+    return Note(
+        id=note_id,
+        x=x,
+        y=y,
+        width=width,
+        height=height,
+        text=text,
+        order=order,
+        color=unpack_color(color),
+        created_at=created_at,
+        edited_at=edited_at,
+        adjusted_at=adjusted_at,
+    )
+
+
+def load_notes(filepath: Path) -> list[Note]:
+    if not filepath.exists():
+        return []
+
+    conn = _connect_readonly(filepath)
+    try:
+        return [_from_row(row) for row in conn.execute(f"SELECT {COLUMNS} FROM notes")]
+    finally:
+        conn.close()
+
+
+def save_notes(filepath: Path, notes: Iterable[Note]) -> None:
+    conn = _connect(filepath)
+    try:
+        with conn:
+            conn.execute("DELETE FROM notes")
+            conn.executemany(UPSERT, (_to_row(n) for n in notes))
+    finally:
+        conn.close()
+
+
+def save_changes(filepath: Path, changes: list[NoteChange]) -> None:
+    deleted = [(c.note_id,) for c in changes if c.note is None]
+    upserted = [_to_row(c.note) for c in changes if c.note is not None]
+    if not deleted and not upserted:
+        return
+
+    conn = _connect(filepath)
+    try:
+        with conn:
+            conn.executemany("DELETE FROM notes WHERE id = ?", deleted)
+            conn.executemany(UPSERT, upserted)
+    finally:
+        conn.close()
+
+
+def _tail(conn: sqlite3.Connection) -> tuple[Note | None, int]:
+    row = conn.execute(f"SELECT {COLUMNS} FROM notes ORDER BY id DESC LIMIT 1").fetchone()
+    (max_order,) = conn.execute('SELECT MAX("order") FROM notes').fetchone()
+    return (_from_row(row) if row else None), (max_order or 0)
+
+
+def append_notes(filepath: Path, make_notes: Callable[[Note | None, int], list[Note]]) -> list[Note]:
+    # SQLite's own write lock spans reading the tail through the insert, so parallel appends never
+    # reuse an id and need no lock file beside the board.
+    conn = _connect(filepath)
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            notes = make_notes(*_tail(conn))
+            conn.executemany(UPSERT, (_to_row(n) for n in notes))
+    finally:
+        conn.close()
+    return notes
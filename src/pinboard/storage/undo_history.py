@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from pathlib import Path
+
+from pinboard.storage.atomic import atomic_write
+
+HISTORY_SUFFIX = ".history"
+COMPACT_BYTES = 16 * 1024 * 1024
+
+
+def history_path(filepath: Path) -> Path:
+    return filepath.with_name(filepath.name + HISTORY_SUFFIX)
+
+
+class UndoHistory:
+    # Append-only JSON lines. Each action line is {"prev": offset, "action": record}, chaining the undo
+    # stack backwards through byte offsets; {"head": offset} lines move the top after undo/redo. The
+    # last complete line always identifies the current top, so startup only reads the file's tail.
+
+    def __init__(self, path: Path, max_bytes: int = COMPACT_BYTES):
+        self._path = path
+        self._map: mmap.mmap | None = None
+        self._file = open(path, "ab+")
+        self._head = self._read_head()
+        if self._file.tell() > max(max_bytes, COMPACT_BYTES):
+            self._compact(max_bytes)
+
+    def close(self) -> None:
+        self._unmap()
+        self._file.close()
+
+    def head(self) -> int | None:
+        return self._head
+
+    def append(self, record: dict, prev: int | None) -> int:
+        offset = self._write({"prev": prev, "action": record})
+        self._head = offset
+        return offset
+
+    def set_head(self, offset: int | None) -> None:
+        if offset != self._head:
+            self._write({"head": offset})
+            self._head = offset
+
+    def read(self, offset: int) -> tuple[dict, int | None] | None:
+        entry = self._line_at(offset)
+        if entry is None or "action" not in entry:
+            return None
+        return entry["action"], entry["prev"]
+
+    def _write(self, entry: dict) -> int:
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+        self._file.flush()
+        return offset
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _mapped(self, size: int) -> mmap.mmap | None:
+        if self._map is None or len(self._map) < size:
+            self._unmap()
+            self._file.flush()
+            length = os.fstat(self._file.fileno()).st_size
+            if length == 0:
+                return None
+            self._map = mmap.mmap(self._file.fileno(), length, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _line_at(self, offset: int) -> dict | None:
+        data = self._mapped(offset + 1)
+        if data is None or offset >= len(data):
+            return None
+        end = data.find(b"\n", offset)
+        if end < 0:
+            return None
+        try:
+            return json.loads(data[offset:end])
+        except ValueError:
+            return None
+
+    def _read_head(self) -> int | None:
+        size = self._file.seek(0, os.SEEK_END)
+        data = self._mapped(size)
+        if data is None:
+            return None
+        end = data.rfind(b"\n")
+        if end < size - 1:
+            # A torn final line from a crash; terminate it so later appends start cleanly.
+            self._file.write(b"\n")
+            self._file.flush()
+        while end > 0:
+            start = data.rfind(b"\n", 0, end) + 1
+            entry = self._line_at(start)
+            if entry is not None:
+                return entry["head"] if "head" in entry else start
+            end = start - 1
+        return None
+
+    def _compact(self, max_bytes: int) -> None:
+        chain: list[str] = []
+        total = 0
+        offset = self._head
+        while offset is not None and total < max_bytes:
+            found = self.read(offset)
+            if found is None:
+                break
+            record, offset = found
+            line = json.dumps(record, separators=(",", ":"))
+            chain.append(line)
+            total += len(line)
+
+        self._unmap()
+        self._file.close()
+        head = None
+        with atomic_write(self._path, "wb") as f:
+            for line in reversed(chain):
+                position = f.tell()
+                f.write(f'{{"prev":{json.dumps(head)},"action":{line}}}\n'.encode())
+                head = position
+        self._file = open(self._path, "ab+")
+        self._head = head
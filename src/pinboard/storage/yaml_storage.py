@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 
 import yaml
 
-from pinboard.models.note import Note
+from pinboard.models.note import Note, NoteChange
+from pinboard.storage import journal, parse_cache
+from pinboard.storage.atomic import atomic_write
+from pinboard.storage.locking import board_lock
+
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+_GENERATION_LINE = re.compile(rb"generation: (\d+)\s*$")
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 @dataclass
@@ -18,6 +30,12 @@ class Config:
     default_width: int
     default_height: int
     padding: int
+    journal: bool
+    lod_text_threshold: float
+    lod_title_threshold: float
+    render_cache: str
+    undo_history_mb: int
+    persistent_undo: bool
 
 
 DEFAULT_CONFIG = {
@@ -36,26 +54,93 @@ DEFAULT_CONFIG = {
     "default_width": 240,
     "default_height": 160,
     "padding": 20,
+    "journal": False,
+    "lod_text_threshold": 0.5,
+    "lod_title_threshold": 0.2,
+    "render_cache": "none",
+    "undo_history_mb": 32,
+    "persistent_undo": True,
 }
 
 
-def load_notes(filepath: Path) -> list[Note]:
-    if not filepath.exists():
-        return []
-
-    with open(filepath, "r") as f:
-        data = yaml.safe_load(f)
-
-    if not data:
-        return []
-
-    return [Note.from_dict(n) for n in data.get("notes", [])]
-
-
-def save_notes(filepath: Path, notes: list[Note]) -> None:
-    data = {"notes": [n.to_dict() for n in notes]}
-    with open(filepath, "w") as f:
-        yaml.dump(data, f, default_flow_style=None, sort_keys=False)
+def load_notes(filepath: Path, use_cache: bool = False) -> list[Note]:
+    notes = []
+    if filepath.exists():
+        notes = _load_snapshot(filepath, use_cache)
+
+    return journal.replay(filepath, notes)
+
+
+def _load_snapshot(filepath: Path, use_cache: bool) -> list[Note]:
+    with open(filepath, "rb") as f:
+        stat = os.fstat(f.fileno())
+        raw = f.read()
+
+    # Only the GUI open path reads and writes the cache; other loads leave no sidecar behind.
+    if use_cache:
+        notes = parse_cache.load(filepath, stat, raw)
+        if notes is not None:
+            return notes
+
+    data = yaml.load(raw, Loader=SafeLoader)
+    notes = [Note.from_dict(n) for n in data.get("notes", [])] if data else []
+    if use_cache:
+        parse_cache.store(filepath, stat, raw, notes)
+    return notes
+
+
+def read_generation(filepath: Path) -> int:
+    # Every snapshot write bumps the counter on the file's first line, so this never parses the board.
+    try:
+        with open(filepath, "rb") as f:
+            match = _GENERATION_LINE.match(f.readline())
+    except FileNotFoundError:
+        return 0
+    return int(match.group(1)) if match else 0
+
+
+def save_notes(filepath: Path, notes: Iterable[Note]) -> int:
+    with board_lock(filepath):
+        generation = read_generation(filepath) + 1
+        data = {"generation": generation, "notes": [n.to_dict() for n in notes]}
+        with atomic_write(filepath) as f:
+            yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=None, sort_keys=False)
+        journal.clear(filepath)
+    return generation
+
+
+def save_merged(
+    filepath: Path, notes: Iterable[Note], changed_ids: set[int], base_generation: int
+) -> tuple[int, bool]:
+    # Full-board write from a writer that last saw base_generation. If anyone committed since, a newer
+    # snapshot or journal records, their notes are kept and only our changed ids are applied on top.
+    with board_lock(filepath):
+        if read_generation(filepath) == base_generation and not journal.journal_path(filepath).exists():
+            return save_notes(filepath, notes), False
+        ours = {note.id: note for note in notes}
+        merged = {note.id: note for note in load_notes(filepath)}
+        for note_id in changed_ids:
+            note = ours.get(note_id)
+            if note is None:
+                merged.pop(note_id, None)
+            else:
+                merged[note_id] = note
+        return save_notes(filepath, merged.values()), True
+
+
+def save_changes(filepath: Path, changes: list[NoteChange]) -> None:
+    records = [r for change in changes for r in journal.records_for_change(change)]
+    if not records:
+        return
+    with board_lock(filepath):
+        journal_size = journal.append_records(filepath, records)
+        if journal_size > JOURNAL_COMPACT_BYTES:
+            compact(filepath)
+
+
+def compact(filepath: Path) -> None:
+    with board_lock(filepath):
+        save_notes(filepath, load_notes(filepath))
 
 
 def load_config(user_config_path: Path | None = None) -> Config:
@@ -63,7 +148,7 @@ def load_config(user_config_path: Path | None = None) -> Config:
 
     if user_config_path and user_config_path.exists():
         with open(user_config_path, "r") as f:
-            user_data = yaml.safe_load(f)
+            user_data = yaml.load(f, Loader=SafeLoader)
         if user_data:
             data.update(user_data)
 
@@ -76,4 +161,10 @@ def load_config(user_config_path: Path | None = None) -> Config:
         default_width=data["default_width"],
         default_height=data["default_height"],
         padding=data["padding"],
+        journal=data["journal"],
+        lod_text_threshold=data["lod_text_threshold"],
+        lod_title_threshold=data["lod_title_threshold"],
+        render_cache=data["render_cache"],
+        undo_history_mb=data["undo_history_mb"],
+        persistent_undo=data["persistent_undo"],
     )
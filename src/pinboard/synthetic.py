@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from itertools import accumulate
+
+from pinboard.models.note import Note
+from pinboard.storage.yaml_storage import DEFAULT_CONFIG
+
+WORDS = (
+    "the of and to in is for on that with as it be at by this from or are an not have we you all can new "
+    "meeting idea todo call review draft plan budget design release bug fix notes client team sprint "
+    "deadline research follow up email question answer travel book read write build test deploy ship"
+).split()
+
+
+@dataclass
+class BoardSpec:
+    notes: int = 10_000
+    words: int = 12  # mean words per note
+    text_distribution: str = "exponential"
+    overlap: float = 0.1  # fraction of notes dropped on top of an earlier one
+    colors: int = 0  # distinct random colors; 0 uses the palette passed in, or the default one
+    width: int = 240
+    height: int = 160
+    padding: int = 20
+    seed: int = 0
+
+
+def _word_count(rng: random.Random, spec: BoardSpec) -> int:
+    if spec.text_distribution == "fixed":
+        return spec.words
+    if spec.text_distribution == "uniform":
+        return rng.randint(0, 2 * spec.words)
+    if spec.text_distribution == "exponential":
+        return min(int(rng.expovariate(1 / spec.words)) if spec.words else 0, 50 * spec.words)
+    raise ValueError(f"Unknown text distribution: {spec.text_distribution}")
+
+
+def make_notes(count: int, **options) -> list[Note]:
+    return generate_notes(BoardSpec(notes=count, **options))
+
+
+def generate_notes(spec: BoardSpec, palette: list[tuple[int, int, int, int]] | None = None) -> list[Note]:
+    # Non-overlapping notes take random cells of a square grid; the rest land offset from an earlier note.
+    rng = random.Random(spec.seed)
+    if palette is None:
+        palette = DEFAULT_CONFIG["palette"]
+    if spec.colors:
+        palette = [(rng.randrange(256), rng.randrange(256), rng.randrange(256), 255) for _ in range(spec.colors)]
+    step_x = spec.width + spec.padding
+    step_y = spec.height + spec.padding
+    side = max(1, int((spec.notes * (1 - spec.overlap)) ** 0.5) + 1)
+    cells = iter(rng.sample(range(side * side), min(side * side, spec.notes)))
+    # Zipf-like word frequencies, so search and text layout see realistic repetition.
+    cum_weights = list(accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+    notes: list[Note] = []
+    for note_id in range(1, spec.notes + 1):
+        if notes and rng.random() < spec.overlap:
+            anchor = rng.choice(notes)
+            x = anchor.x + rng.uniform(-spec.width / 2, spec.width / 2)
+            y = anchor.y + rng.uniform(-spec.height / 2, spec.height / 2)
+        else:
+            cell = next(cells, None)
+            if cell is None:
+                cell = rng.randrange(side * side)
+            x, y = (cell % side) * step_x + spec.padding, (cell // side) * step_y + spec.padding
+        text = " ".join(rng.choices(WORDS, cum_weights=cum_weights, k=_word_count(rng, spec)))
+        notes.append(
+            Note(
+                id=note_id,
+                x=x,
+                y=y,
+                width=spec.width,
+                height=spec.height,
+                text=text,
+                order=note_id,
+                color=rng.choice(palette),
+                created_at="2024-01-01T00:00:00Z",
+            )
+        )
+    return notes
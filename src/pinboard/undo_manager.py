@@ -1,12 +1,30 @@
+from __future__ import annotations
+
+import sys
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Iterator
 
 if TYPE_CHECKING:
     from models.note import Note
+    from storage.undo_history import UndoHistory
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+COALESCE_SECONDS = 1.0
+ACTION_OVERHEAD_BYTES = 256
+
+
+def _note_bytes(note: "Note") -> int:
+    return ACTION_OVERHEAD_BYTES + sys.getsizeof(note.text)
 
 
 class Action(ABC):
+    history_offset: int | None = None
+    history_prev: int | None = None
+
     @abstractmethod
     def undo(self) -> None:
         pass
@@ -15,6 +33,35 @@ class Action(ABC):
     def redo(self) -> None:
         pass
 
+    @abstractmethod
+    def to_record(self) -> dict:
+        pass
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD_BYTES
+
+    def merge(self, other: "Action") -> bool:
+        return False
+
+
+class CompositeAction(Action):
+    def __init__(self, actions: list[Action]):
+        self.actions = actions
+
+    def undo(self) -> None:
+        for action in reversed(self.actions):
+            action.undo()
+
+    def redo(self) -> None:
+        for action in self.actions:
+            action.redo()
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD_BYTES + sum(action.size() for action in self.actions)
+
+    def to_record(self) -> dict:
+        return {"op": "group", "actions": [action.to_record() for action in self.actions]}
+
 
 @dataclass
 class CreateNoteAction(Action):
@@ -29,6 +76,12 @@ class CreateNoteAction(Action):
     def redo(self) -> None:
         self.recreate_callback(self.note_data)
 
+    def size(self) -> int:
+        return _note_bytes(self.note_data)
+
+    def to_record(self) -> dict:
+        return {"op": "create", "note": self.note_data.to_dict()}
+
 
 @dataclass
 class DeleteNoteAction(Action):
@@ -42,6 +95,12 @@ class DeleteNoteAction(Action):
     def redo(self) -> None:
         self.delete_callback(self.note_data.id)
 
+    def size(self) -> int:
+        return _note_bytes(self.note_data)
+
+    def to_record(self) -> dict:
+        return {"op": "delete", "note": self.note_data.to_dict()}
+
 
 @dataclass
 class MoveNoteAction(Action):
@@ -58,6 +117,15 @@ class MoveNoteAction(Action):
     def redo(self) -> None:
         self.update_callback(self.note_id, self.new_x, self.new_y)
 
+    def merge(self, other: Action) -> bool:
+        if not isinstance(other, MoveNoteAction) or other.note_id != self.note_id:
+            return False
+        self.new_x, self.new_y = other.new_x, other.new_y
+        return True
+
+    def to_record(self) -> dict:
+        return {"op": "move", "id": self.note_id, "old": [self.old_x, self.old_y], "new": [self.new_x, self.new_y]}
+
 
 @dataclass
 class ResizeNoteAction(Action):
@@ -74,19 +142,74 @@ class ResizeNoteAction(Action):
     def redo(self) -> None:
         self.update_callback(self.note_id, self.new_width, self.new_height)
 
+    def merge(self, other: Action) -> bool:
+        if not isinstance(other, ResizeNoteAction) or other.note_id != self.note_id:
+            return False
+        self.new_width, self.new_height = other.new_width, other.new_height
+        return True
+
+    def to_record(self) -> dict:
+        return {
+            "op": "resize",
+            "id": self.note_id,
+            "old": [self.old_width, self.old_height],
+            "new": [self.new_width, self.new_height],
+        }
+
 
 @dataclass
 class EditTextAction(Action):
+    # Only the changed span is kept: text[start:start + len(new_part)] replaced old_part.
     note_id: int
-    old_text: str
-    new_text: str
+    start: int
+    old_part: str
+    new_part: str
+    text_callback: Callable[[int], str | None]
     update_callback: Callable[[int, str], None]
 
+    @classmethod
+    def from_texts(
+        cls,
+        note_id: int,
+        old_text: str,
+        new_text: str,
+        text_callback: Callable[[int], str | None],
+        update_callback: Callable[[int, str], None],
+    ) -> "EditTextAction":
+        limit = min(len(old_text), len(new_text))
+        start = 0
+        while start < limit and old_text[start] == new_text[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old_text[-1 - end] == new_text[-1 - end]:
+            end += 1
+        return cls(
+            note_id=note_id,
+            start=start,
+            old_part=old_text[start : len(old_text) - end],
+            new_part=new_text[start : len(new_text) - end],
+            text_callback=text_callback,
+            update_callback=update_callback,
+        )
+
+    def _replace(self, current: str, new: str) -> None:
+        text = self.text_callback(self.note_id)
+        if text is None:
+            # The note is gone (deleted elsewhere); skip it like move and resize do.
+            return
+        self.update_callback(self.note_id, text[: self.start] + new + text[self.start + len(current) :])
+
     def undo(self) -> None:
-        self.update_callback(self.note_id, self.old_text)
+        self._replace(self.new_part, self.old_part)
 
     def redo(self) -> None:
-        self.update_callback(self.note_id, self.new_text)
+        self._replace(self.old_part, self.new_part)
+
+    def size(self) -> int:
+        return ACTION_OVERHEAD_BYTES + sys.getsizeof(self.old_part) + sys.getsizeof(self.new_part)
+
+    def to_record(self) -> dict:
+        return {"op": "text", "id": self.note_id, "start": self.start, "old": self.old_part, "new": self.new_part}
 
 
 @dataclass
@@ -102,6 +225,9 @@ class ChangeColorAction(Action):
     def redo(self) -> None:
         self.update_callback(self.note_id, self.new_color)
 
+    def to_record(self) -> dict:
+        return {"op": "color", "id": self.note_id, "old": list(self.old_color), "new": list(self.new_color)}
+
 
 @dataclass
 class ChangeOrderAction(Action):
@@ -116,37 +242,144 @@ class ChangeOrderAction(Action):
     def redo(self) -> None:
         self.update_callback(self.note_id, self.new_order)
 
+    def to_record(self) -> dict:
+        return {"op": "order", "id": self.note_id, "old": self.old_order, "new": self.new_order}
+
 
 class UndoManager:
-    def __init__(self, max_size: int = 100):
-        self._undo_stack: list[Action] = []
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, coalesce_seconds: float = COALESCE_SECONDS):
+        self._undo_stack: deque[Action] = deque()
         self._redo_stack: list[Action] = []
-        self._max_size = max_size
+        self._sizes: dict[int, int] = {}
+        self._bytes = 0
+        self._max_bytes = max_bytes
+        self._coalesce_seconds = coalesce_seconds
+        self._last_push: float | None = None
+        self._group: list[Action] | None = None
+        self._group_depth = 0
+        self._history: UndoHistory | None = None
+        self._restore: Callable[[dict], Action] | None = None
+        self._history_floor: int | None = None
+
+    def attach_history(self, history: "UndoHistory", restore: Callable[[dict], Action]) -> None:
+        # Actions below the in-memory stack stay on disk and are restored one at a time on undo.
+        self._history = history
+        self._restore = restore
+        self._history_floor = history.head()
+
+    def close(self) -> None:
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+
+    def _top_offset(self) -> int | None:
+        return self._undo_stack[-1].history_offset if self._undo_stack else self._history_floor
+
+    def _persist(self, action: Action, prev: int | None) -> None:
+        if self._history is not None:
+            action.history_prev = prev
+            action.history_offset = self._history.append(action.to_record(), prev)
+
+    def _load_from_history(self) -> bool:
+        if self._history is None or self._history_floor is None:
+            return False
+        try:
+            found = self._history.read(self._history_floor)
+            if found is None:
+                self._history_floor = None
+                return False
+            record, prev = found
+            action = self._restore(record)
+        except (KeyError, TypeError, ValueError):
+            # A corrupt, truncated or unknown record ends the history like a missing one.
+            self._history_floor = None
+            return False
+        action.history_offset, action.history_prev = self._history_floor, prev
+        self._history_floor = prev
+        self._undo_stack.append(action)
+        self._account(action)
+        return True
 
     def push(self, action: Action) -> None:
+        if self._group is not None:
+            self._group.append(action)
+            return
+        self._drop_redo()
+        now = time.monotonic()
+        last_push, self._last_push = self._last_push, now
+        if self._undo_stack and last_push is not None and now - last_push <= self._coalesce_seconds:
+            top = self._undo_stack[-1]
+            if top.merge(action):
+                self._account(top)
+                self._persist(top, top.history_prev)
+                return
+        self._persist(action, self._top_offset())
         self._undo_stack.append(action)
+        self._account(action)
+        # Always keep the newest action, even if it alone is over budget.
+        while self._bytes > self._max_bytes and len(self._undo_stack) > 1:
+            evicted = self._undo_stack.popleft()
+            self._forget(evicted)
+            if evicted.history_offset is not None:
+                self._history_floor = evicted.history_offset
+
+    @contextmanager
+    def group(self) -> Iterator[None]:
+        if self._group_depth == 0:
+            self._group = []
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                actions, self._group = self._group, None
+                if len(actions) == 1:
+                    self.push(actions[0])
+                elif actions:
+                    self.push(CompositeAction(actions))
+                self._last_push = None
+
+    def _account(self, action: Action) -> None:
+        size = action.size()
+        self._bytes += size - self._sizes.get(id(action), 0)
+        self._sizes[id(action)] = size
+
+    def _forget(self, action: Action) -> None:
+        self._bytes -= self._sizes.pop(id(action), 0)
+
+    def _drop_redo(self) -> None:
+        for action in self._redo_stack:
+            self._forget(action)
         self._redo_stack.clear()
-        if len(self._undo_stack) > self._max_size:
-            self._undo_stack.pop(0)
+
+    def history_bytes(self) -> int:
+        return self._bytes
 
     def undo(self) -> bool:
-        if not self._undo_stack:
+        if not self._undo_stack and not self._load_from_history():
             return False
+        self._last_push = None
         action = self._undo_stack.pop()
         action.undo()
         self._redo_stack.append(action)
+        if self._history is not None:
+            self._history.set_head(self._top_offset())
         return True
 
     def redo(self) -> bool:
         if not self._redo_stack:
             return False
+        self._last_push = None
         action = self._redo_stack.pop()
         action.redo()
         self._undo_stack.append(action)
+        if self._history is not None:
+            self._history.set_head(action.history_offset)
         return True
 
     def can_undo(self) -> bool:
-        return len(self._undo_stack) > 0
+        return len(self._undo_stack) > 0 or self._history_floor is not None
 
     def can_redo(self) -> bool:
         return len(self._redo_stack) > 0
@@ -154,3 +387,9 @@ class UndoManager:
     def clear(self) -> None:
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self._last_push = None
+        self._history_floor = None
+        if self._history is not None:
+            self._history.set_head(None)
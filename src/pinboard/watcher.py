@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QThreadPool, QTimer, Signal
+
+from pinboard.models.note_store import NoteStore
+from pinboard.storage.backend import board_stamp, load_notes, read_generation
+from pinboard.storage.journal import journal_path
+from pinboard.storage.sqlite_storage import is_sqlite_path
+
+if TYPE_CHECKING:
+    from pinboard.widgets.canvas import PinboardCanvas
+
+RELOAD_DEBOUNCE_MS = 200
+
+
+class BoardWatcher(QObject):
+    changed = Signal(object, object)  # added or changed notes, removed ids
+    reloaded = Signal(int)  # generation the merged notes were read at
+    failed = Signal(str)
+    _diffed = Signal(object)  # (generation, notes, removed) or None when the reload failed
+
+    def __init__(
+        self,
+        file_path: Path,
+        canvas: PinboardCanvas,
+        is_saving: Callable[[], bool],
+        parent: QObject | None = None,
+    ):
+        super().__init__(parent)
+        self._file_path = file_path
+        self._canvas = canvas
+        self._is_saving = is_saving
+        companion = file_path.with_name(file_path.name + "-wal") if is_sqlite_path(file_path) else journal_path(file_path)
+        self._paths = [str(file_path), str(companion)]
+        self._stamp = board_stamp(str(file_path))
+        self._reloading = False
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._check)
+        # The directory catches atomic replaces and the journal appearing; the files catch appends.
+        self._watcher = QFileSystemWatcher([str(file_path.parent)], self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._diffed.connect(self._on_diffed)
+        self._watch_files()
+
+    def is_pending(self) -> bool:
+        return self._reloading or self._timer.isActive()
+
+    def acknowledge(self, stamp: str) -> None:
+        # Our own save; the change notifications it causes must not trigger a reload.
+        self._stamp = stamp
+
+    def close(self) -> None:
+        self._timer.stop()
+        self._watcher.removePaths(self._watcher.files() + self._watcher.directories())
+        self._pool.waitForDone()
+
+    def _watch_files(self) -> None:
+        watched = set(self._watcher.files())
+        missing = [path for path in self._paths if path not in watched and Path(path).exists()]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_changed(self, _path: str) -> None:
+        self._timer.start(RELOAD_DEBOUNCE_MS)
+
+    def _check(self) -> None:
+        self._watch_files()
+        if self._reloading or self._is_saving():
+            # A diff read around our own write would undo the edits being saved.
+            self._timer.start(RELOAD_DEBOUNCE_MS)
+            return
+        stamp = board_stamp(str(self._file_path))
+        if stamp == self._stamp or not self._file_path.exists():
+            return
+        self._stamp = stamp
+        self._reloading = True
+        store = self._canvas.snapshot()
+        self._pool.start(lambda: self._reload(store))
+
+    def _reload(self, store: NoteStore) -> None:
+        try:
+            generation = read_generation(self._file_path)
+            notes = load_notes(self._file_path)
+        except Exception as e:
+            self.failed.emit(str(e))
+            self._diffed.emit(None)
+            return
+        ids = {note.id for note in notes}
+        changed = [note for note in notes if store.get(note.id) != note]
+        removed = [note_id for note_id in store.ids() if note_id not in ids]
+        self._diffed.emit((generation, changed, removed))
+
+    def _on_diffed(self, diff: tuple[int, list, list[int]] | None) -> None:
+        self._reloading = False
+        if diff is None:
+            return
+        generation, changed, removed = diff
+        if changed or removed:
+            self.changed.emit(changed, removed)
+        self.reloaded.emit(generation)
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import bisect
+import math
 import random
-from typing import Callable
+import time
+from dataclasses import replace
+from typing import Callable, Iterable
 
-from PySide6.QtCore import Qt, Signal, QPointF
+from PySide6.QtCore import Qt, Signal, QPointF, QRectF, QTimer
 from PySide6.QtGui import QAction, QColor, QPainter, QWheelEvent
 from PySide6.QtGui import QClipboard
-from PySide6.QtWidgets import QApplication, QGraphicsScene, QGraphicsView, QMenu
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene, QGraphicsView, QMenu
 
-from pinboard.models.note import Note, utc_now
+from pinboard.coalescer import CanvasUpdate, SignalCoalescer
+from pinboard.models.note import Note, NoteChange, utc_now
+from pinboard.models.note_store import NoteStore, NoteView
+from pinboard.spatial_index import SpatialIndex
 from pinboard.storage.yaml_storage import Config
 from pinboard.undo_manager import (
+    Action,
     ChangeColorAction,
     ChangeOrderAction,
+    CompositeAction,
     CreateNoteAction,
     DeleteNoteAction,
     EditTextAction,
@@ -22,10 +31,26 @@ from pinboard.undo_manager import (
 )
 from pinboard.widgets.note_item import NoteItem
 
+DEFAULT_SCENE_RECT = (-5000, -5000, 25000, 25000)
+SCENE_MARGIN = 5000
+NOTES_PER_BSP_LEAF = 16
+MIN_BSP_DEPTH = 4
+MAX_BSP_DEPTH = 16
+SELECTION_TEXT_SEPARATOR = "\n\n"
+EAGER_LOAD_LIMIT = 2000
+LOAD_SLICE_SECONDS = 0.008
+CACHE_MODES = {
+    "none": QGraphicsItem.CacheMode.NoCache,
+    "device": QGraphicsItem.CacheMode.DeviceCoordinateCache,
+    "item": QGraphicsItem.CacheMode.ItemCoordinateCache,
+}
+
 
 class PinboardCanvas(QGraphicsView):
+    updated = Signal(object)  # CanvasUpdate, at most once per frame
     notes_changed = Signal()
     viewport_changed = Signal()
+    loaded = Signal(float, float)  # seconds to first paint, seconds to fully loaded
 
     def __init__(
         self,
@@ -34,8 +59,13 @@ class PinboardCanvas(QGraphicsView):
     ):
         super().__init__()
 
+        if config.render_cache not in CACHE_MODES:
+            raise ValueError(f"Unknown render_cache: {config.render_cache}")
+        self._cache_mode = CACHE_MODES[config.render_cache]
+
         self._scene = QGraphicsScene()
-        self._scene.setSceneRect(-5000, -5000, 25000, 25000)
+        self._scene.setSceneRect(*DEFAULT_SCENE_RECT)
+        self._scene.setBspTreeDepth(MIN_BSP_DEPTH)
         r, g, b, a = config.canvas_background
         self._scene.setBackgroundBrush(QColor(r, g, b, a))
         self.setScene(self._scene)
@@ -43,10 +73,31 @@ class PinboardCanvas(QGraphicsView):
         self._config = config
         self._undo_manager = undo_manager
         self._notes: dict[int, NoteItem] = {}
+        self._store = NoteStore()
         self._next_id = 1
+        self._changes: dict[int, set[str]] = {}
+        self._index = SpatialIndex()
+        self._sorted_ids: list[int] = []
+        self._max_order = 0
+        self._min_order = 0
+        self._editing_item: NoteItem | None = None
+        self._unloaded: set[int] = set()
+        self._load_queue: list[int] = []
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.timeout.connect(self._load_chunk)
+        self._load_started: float | None = None
+        self._first_paint_seconds: float | None = None
+        self._loaded_seconds: float | None = None
+        self._frame_seconds = 0.0
+        self._frame_paints = 0
+        self._coalescer = SignalCoalescer(parent=self)
+        self._coalescer.flushed.connect(self._on_coalesced)
 
         self._panning = False
         self._pan_start: QPointF | None = None
+        self._drag_origins: dict[int, QPointF] = {}
+        self._search_hits: set[int] = set()
 
         self.setRenderHints(
             self.renderHints() | QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
@@ -57,6 +108,9 @@ class PinboardCanvas(QGraphicsView):
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        if self._cache_mode != QGraphicsItem.CacheMode.NoCache:
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+            self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
 
         self._viewport_initialized = False
 
@@ -65,52 +119,367 @@ class PinboardCanvas(QGraphicsView):
             self._viewport_initialized = True
             self.horizontalScrollBar().setValue(0)
             self.verticalScrollBar().setValue(0)
+        start = time.perf_counter()
+        paints = NoteItem.paint_calls
         super().paintEvent(event)
+        self._frame_seconds = time.perf_counter() - start
+        self._frame_paints = NoteItem.paint_calls - paints
+        if self._load_started is not None and self._first_paint_seconds is None:
+            self._first_paint_seconds = time.perf_counter() - self._load_started
+            self._report_load()
 
     def reset_viewport(self) -> None:
         self.resetTransform()
         self.horizontalScrollBar().setValue(0)
         self.verticalScrollBar().setValue(0)
-        self.viewport_changed.emit()
+        self._on_viewport_moved()
 
     def scroll(self, dx: int, dy: int) -> None:
         self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() + dx)
         self.verticalScrollBar().setValue(self.verticalScrollBar().value() + dy)
-        self.viewport_changed.emit()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        super().scrollContentsBy(dx, dy)
+        self._on_viewport_moved()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._on_viewport_moved()
+
+    def _on_viewport_moved(self) -> None:
+        if self._unloaded:
+            self._load_visible()
+        self._coalescer.mark_viewport()
+
+    def flush_updates(self) -> None:
+        self._coalescer.flush()
+
+    def _on_coalesced(self, update: CanvasUpdate) -> None:
+        self.updated.emit(update)
+        if update.note_ids:
+            self.notes_changed.emit()
+        if update.viewport:
+            self.viewport_changed.emit()
 
     def load_notes(self, notes: list[Note]) -> None:
+        self._load_started = time.perf_counter()
+        self._first_paint_seconds = None
+        self._loaded_seconds = None
+        self._load_timer.stop()
+        self._load_queue = []
+        self._unloaded = set()
+
         self._scene.clear()
+        self._scene.setSceneRect(*DEFAULT_SCENE_RECT)
         self._notes.clear()
+        self._index.clear()
+        self._editing_item = None
+        self._search_hits = set()
+        self._store = NoteStore(notes)
+
+        for note in notes:
+            self._index.insert(note.id, note.x, note.y, note.width, note.height)
+        self._sorted_ids = sorted(note.id for note in notes)
+        orders = [note.order for note in notes]
+        self._max_order = max(orders, default=0)
+        self._min_order = min(orders, default=0)
+        bounds = self._index.bounds()
+        if bounds is not None:
+            min_x, min_y, max_x, max_y = bounds
+            self._grow_scene_rect(min_x, min_y, max_x - min_x, max_y - min_y)
+        self._tune_bsp_depth()
+
+        ordered = sorted(notes, key=lambda n: n.order)
+        if len(ordered) <= EAGER_LOAD_LIMIT:
+            for note in ordered:
+                self._create_item(note)
+        else:
+            self._unloaded = {note.id for note in ordered}
+            self._load_visible()
+            self._queue_unloaded()
 
-        for note in sorted(notes, key=lambda n: n.order):
-            self._add_note_item(note, record_undo=False)
-
-        if self._notes:
-            max_id = max(self._notes.keys())
+        if self._sorted_ids:
+            max_id = self._sorted_ids[-1]
             self._next_id = max_id + 1
-            self._notes[max_id].setSelected(True)
+            self._item(max_id).setSelected(True)
         else:
             self._next_id = 1
+        self._changes.clear()
+        self._coalescer.discard()
+        self._coalescer.mark_reloaded()
+        if not self._unloaded:
+            self._finish_loading()
+
+    def is_loading(self) -> bool:
+        return bool(self._unloaded)
+
+    def _loading_viewport(self) -> tuple[float, float, float, float]:
+        if self._viewport_initialized:
+            min_x, min_y, max_x, max_y = self._get_viewport_scene_rect()
+            return min_x, min_y, max_x - min_x, max_y - min_y
+        # The first paint scrolls to the origin, so that is what will be shown first.
+        viewport_rect = self.viewport().rect()
+        return 0, 0, viewport_rect.width() / self.transform().m11(), viewport_rect.height() / self.transform().m22()
+
+    def _load_visible(self) -> None:
+        x, y, width, height = self._loading_viewport()
+        for note_id in self._index.query(x - width / 2, y - height / 2, width * 2, height * 2):
+            self._item(note_id)
+
+    def _queue_unloaded(self) -> None:
+        x, y, width, height = self._loading_viewport()
+        center_x = x + width / 2
+        center_y = y + height / 2
+
+        def distance(note_id: int) -> float:
+            x, y, width, height = self._store.rect(note_id)
+            return (x + width / 2 - center_x) ** 2 + (y + height / 2 - center_y) ** 2
+
+        # Farthest first, so the next note to load is popped off the end.
+        self._load_queue = sorted(self._unloaded, key=distance, reverse=True)
+        self._load_timer.start(0)
+
+    def _load_chunk(self) -> None:
+        deadline = time.perf_counter() + LOAD_SLICE_SECONDS
+        queue = self._load_queue
+        while queue:
+            note_id = queue.pop()
+            if note_id in self._unloaded:
+                self._unloaded.remove(note_id)
+                self._create_item(self._store.view(note_id))
+                if time.perf_counter() >= deadline:
+                    break
+        if self._unloaded:
+            self._load_timer.start(0)
+        else:
+            self._load_queue = []
+            self._finish_loading()
+
+    def _finish_loading(self) -> None:
+        if self._load_started is not None:
+            self._loaded_seconds = time.perf_counter() - self._load_started
+            self._report_load()
+
+    def _report_load(self) -> None:
+        if self._first_paint_seconds is None or self._loaded_seconds is None:
+            return
+        self.loaded.emit(self._first_paint_seconds, self._loaded_seconds)
+        self._load_started = None
+
+    def _item(self, note_id: int) -> NoteItem | None:
+        item = self._notes.get(note_id)
+        if item is None and note_id in self._unloaded:
+            self._unloaded.remove(note_id)
+            item = self._create_item(self._store.view(note_id))
+        return item
 
     def get_notes(self) -> list[Note]:
-        return [
-            Note(
-                id=item.note_id,
-                x=item.pos().x(),
-                y=item.pos().y(),
-                width=item.rect().width(),
-                height=item.rect().height(),
-                text=item.text,
-                order=item.order,
-                color=item.color,
-                created_at=item.created_at,
-                edited_at=item.edited_at,
-                adjusted_at=item.adjusted_at,
-            )
-            for item in self._notes.values()
+        return self._store.to_notes()
+
+    def snapshot(self) -> NoteStore:
+        return self._store.copy()
+
+    def frame_stats(self) -> tuple[float, int]:
+        return self._frame_seconds, self._frame_paints
+
+    def note_count(self) -> int:
+        return len(self._sorted_ids)
+
+    def note_ids(self) -> list[int]:
+        return list(self._sorted_ids)
+
+    def note_box(self, note_id: int) -> tuple[float, float, float, float, tuple[int, int, int, int]] | None:
+        rect = self._index.rect(note_id)
+        if rect is None:
+            return None
+        return rect + (self._store.color(note_id),)
+
+    def get_last_note(self) -> Note | None:
+        item = self._last_item()
+        return item.to_note() if item else None
+
+    def notes_in_rect(self, x: float, y: float, width: float, height: float) -> list[NoteItem]:
+        return [self._item(note_id) for note_id in self._index.query(x, y, width, height)]
+
+    def notes_bounds(self) -> tuple[float, float, float, float] | None:
+        return self._index.bounds()
+
+    def _last_item(self) -> NoteItem | None:
+        if not self._sorted_ids:
+            return None
+        return self._item(self._sorted_ids[-1])
+
+    def _track_order(self, order: int) -> None:
+        if len(self._sorted_ids) <= 1:
+            self._max_order = self._min_order = order
+        else:
+            self._max_order = max(self._max_order, order)
+            self._min_order = min(self._min_order, order)
+
+    def _index_item(self, item: NoteItem) -> None:
+        pos = item.pos()
+        rect = item.rect()
+        self._index.update(item.note_id, pos.x(), pos.y(), rect.width(), rect.height())
+        self._grow_scene_rect(pos.x(), pos.y(), rect.width(), rect.height())
+
+    def _grow_scene_rect(self, x: float, y: float, width: float, height: float) -> None:
+        needed = QRectF(x, y, width, height).adjusted(-SCENE_MARGIN, -SCENE_MARGIN, SCENE_MARGIN, SCENE_MARGIN)
+        scene_rect = self._scene.sceneRect()
+        if not scene_rect.contains(needed):
+            self._scene.setSceneRect(scene_rect.united(needed))
+
+    def _tune_bsp_depth(self) -> None:
+        leaves = max(1, len(self._sorted_ids) // NOTES_PER_BSP_LEAF)
+        depth = max(MIN_BSP_DEPTH, min(MAX_BSP_DEPTH, math.ceil(math.log2(leaves))))
+        if depth != self._scene.bspTreeDepth():
+            self._scene.setBspTreeDepth(depth)
+
+    def add_note(self, note: Note) -> NoteItem:
+        note = replace(note, id=self._next_id)
+        self._next_id += 1
+        item = self._add_note_item(note, record_undo=True)
+        return item
+
+    def get_note(self, note_id: int) -> Note | None:
+        return self._store.get(note_id)
+
+    def note_text(self, note_id: int) -> str | None:
+        view = self._store.view(note_id)
+        return None if view is None else view.text
+
+    def take_changes(self) -> list[NoteChange]:
+        changes = [
+            NoteChange(note_id=note_id, kinds=kinds, note=self.get_note(note_id))
+            for note_id, kinds in self._changes.items()
         ]
+        self._changes = {}
+        return changes
+
+    def clear_changes(self) -> None:
+        self._changes = {}
+
+    def take_changed_ids(self) -> set[int]:
+        changed_ids = set(self._changes)
+        self._changes = {}
+        return changed_ids
+
+    def has_changes(self) -> bool:
+        return bool(self._changes)
+
+    def _mark_changed(self, note_id: int, kind: str) -> None:
+        item = self._notes.get(note_id)
+        if item is not None:
+            self._store.put(item.to_note())
+        self._changes.setdefault(note_id, set()).add(kind)
+        self._coalescer.mark_note(note_id)
+
+    def merge_notes(self, notes: list[Note], removed: list[int]) -> None:
+        # Apply another writer's edits by id without touching the scene, selection or undo history.
+        # Notes with unsaved local edits keep the local version; none of this is saved back.
+        pending = self._changes
+        self._changes = {}
+        editing_id = self._editing_item.note_id if self._editing_item is not None else None
+        for note_id in removed:
+            if note_id not in pending and note_id != editing_id:
+                self._delete_note_by_id(note_id)
+        for note in notes:
+            if note.id == editing_id:
+                continue
+            if note.id in pending:
+                if "create" not in pending[note.id]:
+                    continue
+                # Both sides created a note with this id; keep ours and save theirs under a fresh one.
+                note = replace(note, id=self._next_id)
+                pending[note.id] = {"create"}
+            if note.id in self._store:
+                self._replace_note(note)
+            else:
+                self._add_note_item(note, record_undo=False)
+            self._next_id = max(self._next_id, note.id + 1)
+        self._changes = pending
+
+    def _replace_note(self, note: Note) -> None:
+        self._store.put(note)
+        item = self._notes.get(note.id)
+        if item is not None:
+            item.setPos(note.x, note.y)
+            item.setRect(0, 0, note.width, note.height)
+            item.set_text(note.text)
+            item.set_color(note.color)
+            item.set_order(note.order)
+            item.created_at, item.edited_at, item.adjusted_at = note.created_at, note.edited_at, note.adjusted_at
+        self._index.update(note.id, note.x, note.y, note.width, note.height)
+        self._grow_scene_rect(note.x, note.y, note.width, note.height)
+        self._track_order(note.order)
+        self._mark_changed(note.id, "merge")
 
     def _add_note_item(self, note: Note, record_undo: bool = True) -> NoteItem:
+        self._store.put(note)
+        item = self._create_item(note)
+        self._index.insert(note.id, note.x, note.y, note.width, note.height)
+        self._grow_scene_rect(note.x, note.y, note.width, note.height)
+        if self._sorted_ids and note.id < self._sorted_ids[-1]:
+            bisect.insort(self._sorted_ids, note.id)
+        else:
+            self._sorted_ids.append(note.id)
+        self._tune_bsp_depth()
+        self._track_order(note.order)
+        self._mark_changed(note.id, "create")
+
+        if record_undo:
+            action = CreateNoteAction(
+                note_id=note.id,
+                delete_callback=self._delete_note_by_id,
+                recreate_callback=self._recreate_note,
+                note_data=note,
+            )
+            self._undo_manager.push(action)
+
+        return item
+
+    def restore_action(self, record: dict) -> Action:
+        op = record["op"]
+        if op == "group":
+            return CompositeAction([self.restore_action(r) for r in record["actions"]])
+        if op == "create":
+            note = Note.from_dict(record["note"])
+            return CreateNoteAction(
+                note_id=note.id,
+                delete_callback=self._delete_note_by_id,
+                recreate_callback=self._recreate_note,
+                note_data=note,
+            )
+        if op == "delete":
+            return DeleteNoteAction(
+                note_data=Note.from_dict(record["note"]),
+                recreate_callback=self._recreate_note,
+                delete_callback=self._delete_note_by_id,
+            )
+        if op == "text":
+            return EditTextAction(
+                note_id=record["id"],
+                start=record["start"],
+                old_part=record["old"],
+                new_part=record["new"],
+                text_callback=self.note_text,
+                update_callback=self._update_note_text,
+            )
+
+        note_id, old, new = record["id"], record["old"], record["new"]
+        if op == "move":
+            return MoveNoteAction(note_id, *old, *new, update_callback=self._update_note_position)
+        if op == "resize":
+            return ResizeNoteAction(note_id, *old, *new, update_callback=self._update_note_size)
+        if op == "color":
+            return ChangeColorAction(note_id, tuple(old), tuple(new), update_callback=self._update_note_color)
+        if op == "order":
+            return ChangeOrderAction(note_id, old, new, update_callback=self._update_note_order)
+        raise ValueError(f"Unknown undo record: {op}")
+
+    def _recreate_note(self, note: Note) -> None:
+        self._add_note_item(note, record_undo=False)
+
+    def _create_item(self, note: Note | NoteView) -> NoteItem:
         item = NoteItem(
             note_id=note.id,
             x=note.x,
@@ -123,27 +492,23 @@ class PinboardCanvas(QGraphicsView):
             text_color=self._config.text_color,
             font_family=self._config.font_family,
             font_size=self._config.font_size,
+            lod_text_threshold=self._config.lod_text_threshold,
+            lod_title_threshold=self._config.lod_title_threshold,
             created_at=note.created_at,
             edited_at=note.edited_at,
             adjusted_at=note.adjusted_at,
         )
+        item.setCacheMode(self._cache_mode)
+        if note.id in self._search_hits:
+            item.set_highlighted(True)
         self._scene.addItem(item)
         self._notes[note.id] = item
 
         item.signals.moved.connect(self._on_note_moved)
         item.signals.resized.connect(self._on_note_resized)
         item.signals.text_changed.connect(self._on_note_text_changed)
-        item.signals.changed.connect(self.notes_changed.emit)
-
-        if record_undo:
-            action = CreateNoteAction(
-                note_id=note.id,
-                delete_callback=self._delete_note_by_id,
-                recreate_callback=lambda n: self._add_note_item(n, record_undo=False),
-                note_data=note,
-            )
-            self._undo_manager.push(action)
-
+        item.signals.edit_started.connect(self._on_edit_started)
+        item.signals.edit_finished.connect(self._on_edit_finished)
         return item
 
     def _get_viewport_scene_rect(self):
@@ -152,48 +517,45 @@ class PinboardCanvas(QGraphicsView):
         bottom_right = self.mapToScene(viewport_rect.bottomRight())
         return top_left.x(), top_left.y(), bottom_right.x(), bottom_right.y()
 
+    def _find_free_slot(self, x: float, y: float, direction: str) -> tuple[float, float]:
+        return self._index.find_free_slot(
+            x,
+            y,
+            self._config.default_width,
+            self._config.default_height,
+            self._config.padding,
+            direction,
+        )
+
     def _calculate_position_right(self) -> tuple[float, float]:
         padding = self._config.padding
-        selected = self.get_selected_note()
-        if selected:
-            return (selected.pos().x() + selected.rect().width() + padding, selected.pos().y())
-        if not self._notes:
-            return (padding, padding)
-        max_id = max(self._notes.keys())
-        last_note = self._notes[max_id]
-        return (last_note.pos().x() + last_note.rect().width() + padding, last_note.pos().y())
+        anchor = self.get_selected_note() or self._last_item()
+        if not anchor:
+            return self._find_free_slot(padding, padding, "right")
+        x = anchor.pos().x() + anchor.rect().width() + padding
+        return self._find_free_slot(x, anchor.pos().y(), "right")
 
     def _calculate_position_below(self) -> tuple[float, float]:
         padding = self._config.padding
-        selected = self.get_selected_note()
-        if selected:
-            return (selected.pos().x(), selected.pos().y() + selected.rect().height() + padding)
-        if not self._notes:
-            return (padding, padding)
-        max_id = max(self._notes.keys())
-        last_note = self._notes[max_id]
-        return (last_note.pos().x(), last_note.pos().y() + last_note.rect().height() + padding)
+        anchor = self.get_selected_note() or self._last_item()
+        if not anchor:
+            return self._find_free_slot(padding, padding, "below")
+        y = anchor.pos().y() + anchor.rect().height() + padding
+        return self._find_free_slot(anchor.pos().x(), y, "below")
 
     def _calculate_position_smart(self) -> tuple[float, float]:
         x, y = self._calculate_position_right()
         viewport_min_x, _, viewport_max_x, _ = self._get_viewport_scene_rect()
         if x + self._config.default_width > viewport_max_x:
             padding = self._config.padding
-            selected = self.get_selected_note()
-            if selected:
-                new_y = selected.pos().y() + selected.rect().height() + padding
-            elif self._notes:
-                max_id = max(self._notes.keys())
-                last_note = self._notes[max_id]
-                new_y = last_note.pos().y() + last_note.rect().height() + padding
-            else:
-                new_y = padding
-            return viewport_min_x + padding, new_y
+            anchor = self.get_selected_note() or self._last_item()
+            new_y = anchor.pos().y() + anchor.rect().height() + padding if anchor else padding
+            return self._find_free_slot(viewport_min_x + padding, new_y, "below")
         return x, y
 
     def _create_note_at(self, x: float, y: float) -> NoteItem:
         color = random.choice(self._config.palette)
-        order = self._get_max_order() + 1
+        order = self.get_max_order() + 1
 
         note = Note(
             id=self._next_id,
@@ -208,69 +570,50 @@ class PinboardCanvas(QGraphicsView):
         )
         self._next_id += 1
         item = self._add_note_item(note, record_undo=True)
-        self.notes_changed.emit()
         return item
 
     def _delete_note_by_id(self, note_id: int) -> None:
-        if note_id in self._notes:
+        if self._item(note_id) is not None:
             item = self._notes.pop(note_id)
             self._scene.removeItem(item)
-
-    def _delete_note(self, item: NoteItem) -> None:
-        note_data = Note(
-            id=item.note_id,
-            x=item.pos().x(),
-            y=item.pos().y(),
-            width=item.rect().width(),
-            height=item.rect().height(),
-            text=item.text,
-            order=item.order,
-            color=item.color,
-            created_at=item.created_at,
-            edited_at=item.edited_at,
-            adjusted_at=item.adjusted_at,
-        )
-
-        action = DeleteNoteAction(
-            note_data=note_data,
-            recreate_callback=lambda n: self._add_note_item(n, record_undo=False),
-            delete_callback=self._delete_note_by_id,
-        )
-        self._undo_manager.push(action)
-
-        self._delete_note_by_id(item.note_id)
-        self.notes_changed.emit()
-
-    def _get_max_order(self) -> int:
-        if not self._notes:
-            return 0
-        return max(item.order for item in self._notes.values())
+            self._index.remove(note_id)
+            self._store.remove(note_id)
+            del self._sorted_ids[bisect.bisect_left(self._sorted_ids, note_id)]
+            self._tune_bsp_depth()
+            if self._editing_item is item:
+                self._editing_item = None
+            self._mark_changed(note_id, "delete")
+
+    def _delete_notes(self, items: list[NoteItem]) -> None:
+        with self._undo_manager.group():
+            for item in items:
+                action = DeleteNoteAction(
+                    note_data=item.to_note(),
+                    recreate_callback=self._recreate_note,
+                    delete_callback=self._delete_note_by_id,
+                )
+                self._undo_manager.push(action)
+
+                self._delete_note_by_id(item.note_id)
+
+    def get_max_order(self) -> int:
+        return self._max_order if self._sorted_ids else 0
 
     def _get_min_order(self) -> int:
-        if not self._notes:
-            return 0
-        return min(item.order for item in self._notes.values())
+        return self._min_order if self._sorted_ids else 0
 
-    def _bring_to_front(self, item: NoteItem) -> None:
-        old_order = item.order
-        new_order = self._get_max_order() + 1
-        if old_order == new_order:
-            return
+    def _bring_to_front(self, items: list[NoteItem]) -> None:
+        with self._undo_manager.group():
+            for item in sorted(items, key=lambda i: i.order):
+                self._change_order(item, self.get_max_order() + 1)
 
-        action = ChangeOrderAction(
-            note_id=item.note_id,
-            old_order=old_order,
-            new_order=new_order,
-            update_callback=self._update_note_order,
-        )
-        self._undo_manager.push(action)
-
-        item.set_order(new_order)
-        self.notes_changed.emit()
+    def _send_to_back(self, items: list[NoteItem]) -> None:
+        with self._undo_manager.group():
+            for item in sorted(items, key=lambda i: i.order, reverse=True):
+                self._change_order(item, self._get_min_order() - 1)
 
-    def _send_to_back(self, item: NoteItem) -> None:
+    def _change_order(self, item: NoteItem, new_order: int) -> None:
         old_order = item.order
-        new_order = self._get_min_order() - 1
         if old_order == new_order:
             return
 
@@ -283,50 +626,84 @@ class PinboardCanvas(QGraphicsView):
         self._undo_manager.push(action)
 
         item.set_order(new_order)
-        self.notes_changed.emit()
-
-    def _change_color(self, item: NoteItem, new_color: tuple[int, int, int, int]) -> None:
-        old_color = item.color
-        if old_color == new_color:
-            return
-
-        action = ChangeColorAction(
-            note_id=item.note_id,
-            old_color=old_color,
-            new_color=new_color,
-            update_callback=self._update_note_color,
-        )
-        self._undo_manager.push(action)
-
-        item.set_color(new_color)
-        self.notes_changed.emit()
+        self._track_order(new_order)
+        self._mark_changed(item.note_id, "order")
+
+    def _change_color(self, items: list[NoteItem], new_color: tuple[int, int, int, int]) -> None:
+        with self._undo_manager.group():
+            for item in items:
+                old_color = item.color
+                if old_color == new_color:
+                    continue
+
+                action = ChangeColorAction(
+                    note_id=item.note_id,
+                    old_color=old_color,
+                    new_color=new_color,
+                    update_callback=self._update_note_color,
+                )
+                self._undo_manager.push(action)
+
+                item.set_color(new_color)
+                self._mark_changed(item.note_id, "color")
 
     def _update_note_order(self, note_id: int, order: int) -> None:
-        if note_id in self._notes:
-            self._notes[note_id].set_order(order)
-            self.notes_changed.emit()
+        item = self._item(note_id)
+        if item is not None:
+            item.set_order(order)
+            self._track_order(order)
+            self._mark_changed(note_id, "order")
 
     def _update_note_color(self, note_id: int, color: tuple[int, int, int, int]) -> None:
-        if note_id in self._notes:
-            self._notes[note_id].set_color(color)
-            self.notes_changed.emit()
+        item = self._item(note_id)
+        if item is not None:
+            item.set_color(color)
+            self._mark_changed(note_id, "color")
 
     def _update_note_position(self, note_id: int, x: float, y: float) -> None:
-        if note_id in self._notes:
-            self._notes[note_id].setPos(x, y)
-            self.notes_changed.emit()
+        item = self._item(note_id)
+        if item is not None:
+            item.setPos(x, y)
+            self._index_item(item)
+            self._mark_changed(note_id, "move")
 
     def _update_note_size(self, note_id: int, width: float, height: float) -> None:
-        if note_id in self._notes:
-            self._notes[note_id].setRect(0, 0, width, height)
-            self.notes_changed.emit()
+        item = self._item(note_id)
+        if item is not None:
+            item.setRect(0, 0, width, height)
+            self._index_item(item)
+            self._mark_changed(note_id, "resize")
 
     def _update_note_text(self, note_id: int, text: str) -> None:
-        if note_id in self._notes:
-            self._notes[note_id].set_text(text)
-            self.notes_changed.emit()
+        item = self._item(note_id)
+        if item is not None:
+            item.set_text(text)
+            self._mark_changed(note_id, "text")
 
     def _on_note_moved(self, note_id: int, old_x: float, old_y: float, new_x: float, new_y: float) -> None:
+        if note_id in self._drag_origins:
+            return
+        self._record_move(note_id, old_x, old_y, new_x, new_y)
+
+    def _finish_group_drag(self) -> None:
+        origins, self._drag_origins = self._drag_origins, {}
+        moves = []
+        for note_id, old_pos in origins.items():
+            item = self._notes.get(note_id)
+            if item is not None and item.pos() != old_pos:
+                moves.append((item, old_pos))
+        if not moves:
+            return
+        adjusted_at = utc_now()
+        with self._undo_manager.group():
+            for item, old_pos in moves:
+                item.adjusted_at = adjusted_at
+                new_pos = item.pos()
+                self._record_move(item.note_id, old_pos.x(), old_pos.y(), new_pos.x(), new_pos.y())
+
+    def _record_move(self, note_id: int, old_x: float, old_y: float, new_x: float, new_y: float) -> None:
+        self._mark_changed(note_id, "move")
+        self._index_item(self._notes[note_id])
         action = MoveNoteAction(
             note_id=note_id,
             old_x=old_x,
@@ -338,6 +715,8 @@ class PinboardCanvas(QGraphicsView):
         self._undo_manager.push(action)
 
     def _on_note_resized(self, note_id: int, old_w: float, old_h: float, new_w: float, new_h: float) -> None:
+        self._mark_changed(note_id, "resize")
+        self._index_item(self._notes[note_id])
         action = ResizeNoteAction(
             note_id=note_id,
             old_width=old_w,
@@ -349,10 +728,12 @@ class PinboardCanvas(QGraphicsView):
         self._undo_manager.push(action)
 
     def _on_note_text_changed(self, note_id: int, old_text: str, new_text: str) -> None:
-        action = EditTextAction(
+        self._mark_changed(note_id, "text")
+        action = EditTextAction.from_texts(
             note_id=note_id,
             old_text=old_text,
             new_text=new_text,
+            text_callback=self.note_text,
             update_callback=self._update_note_text,
         )
         self._undo_manager.push(action)
@@ -364,12 +745,14 @@ class PinboardCanvas(QGraphicsView):
         menu = QMenu(self)
 
         if isinstance(item, NoteItem):
+            targets = self.get_selected_notes() if item.isSelected() else [item]
+
             bring_front_action = QAction("Bring to Front", self)
-            bring_front_action.triggered.connect(lambda: self._bring_to_front(item))
+            bring_front_action.triggered.connect(lambda: self._bring_to_front(targets))
             menu.addAction(bring_front_action)
 
             send_back_action = QAction("Send to Back", self)
-            send_back_action.triggered.connect(lambda: self._send_to_back(item))
+            send_back_action.triggered.connect(lambda: self._send_to_back(targets))
             menu.addAction(send_back_action)
 
             menu.addSeparator()
@@ -382,7 +765,7 @@ class PinboardCanvas(QGraphicsView):
                 color_menu.addAction(action)
 
                 def make_color_handler(c: tuple[int, int, int, int]) -> Callable:
-                    return lambda: self._change_color(item, c)
+                    return lambda: self._change_color(targets, c)
 
                 action.triggered.connect(make_color_handler(color))
 
@@ -392,7 +775,7 @@ class PinboardCanvas(QGraphicsView):
             menu.addSeparator()
 
             delete_action = QAction("Delete", self)
-            delete_action.triggered.connect(lambda: self._delete_note(item))
+            delete_action.triggered.connect(lambda: self._delete_notes(targets))
             menu.addAction(delete_action)
         else:
             new_note_action = QAction("New Note", self)
@@ -407,32 +790,30 @@ class PinboardCanvas(QGraphicsView):
             return selected[0]
         return None
 
+    def get_selected_notes(self) -> list[NoteItem]:
+        items = [item for item in self._scene.selectedItems() if isinstance(item, NoteItem)]
+        items.sort(key=lambda item: item.note_id)
+        return items
+
     def yank_selected(self) -> bool:
-        item = self.get_selected_note()
-        if not item:
+        items = self.get_selected_notes()
+        if not items:
             return False
         clipboard = QApplication.clipboard()
-        clipboard.setText(item.text)
+        clipboard.setText(SELECTION_TEXT_SEPARATOR.join(item.text for item in items))
         return True
 
     def cut_selected(self) -> bool:
-        item = self.get_selected_note()
-        if not item:
+        if not self.yank_selected():
             return False
-        clipboard = QApplication.clipboard()
-        clipboard.setText(item.text)
-        deleted_id = item.note_id
-        self._delete_note(item)
-        self.select_prev_note(from_id=deleted_id)
-        return True
+        return self.delete_selected()
 
     def delete_selected(self) -> bool:
-        item = self.get_selected_note()
-        if not item:
+        items = self.get_selected_notes()
+        if not items:
             return False
-        deleted_id = item.note_id
-        self._delete_note(item)
-        self.select_prev_note(from_id=deleted_id)
+        self._delete_notes(items)
+        self.select_prev_note(from_id=items[0].note_id)
         return True
 
     def paste_as_new_note(self) -> bool:
@@ -442,7 +823,7 @@ class PinboardCanvas(QGraphicsView):
             return False
 
         color = random.choice(self._config.palette)
-        order = self._get_max_order() + 1
+        order = self.get_max_order() + 1
         x, y = self._calculate_position_smart()
 
         note = Note(
@@ -460,7 +841,6 @@ class PinboardCanvas(QGraphicsView):
         item = self._add_note_item(note, record_undo=True)
         self._scene.clearSelection()
         item.setSelected(True)
-        self.notes_changed.emit()
         return True
 
     def paste_from_selection(self) -> bool:
@@ -470,7 +850,7 @@ class PinboardCanvas(QGraphicsView):
             return False
 
         color = random.choice(self._config.palette)
-        order = self._get_max_order() + 1
+        order = self.get_max_order() + 1
         x, y = self._calculate_position_smart()
 
         note = Note(
@@ -488,52 +868,67 @@ class PinboardCanvas(QGraphicsView):
         item = self._add_note_item(note, record_undo=True)
         self._scene.clearSelection()
         item.setSelected(True)
-        self.notes_changed.emit()
         return True
 
-    def select_next_note(self) -> None:
-        if not self._notes:
+    def select_next_note(self, extend: bool = False) -> None:
+        if not self._sorted_ids:
             return
 
-        sorted_ids = sorted(self._notes.keys())
-        current = self.get_selected_note()
+        sorted_ids = self._sorted_ids
+        selected = self.get_selected_notes()
 
-        if current is None:
+        if not selected:
             next_id = sorted_ids[0]
         else:
-            current_idx = sorted_ids.index(current.note_id)
-            next_idx = (current_idx + 1) % len(sorted_ids)
+            next_idx = bisect.bisect_right(sorted_ids, selected[-1].note_id) % len(sorted_ids)
             next_id = sorted_ids[next_idx]
 
-        self._scene.clearSelection()
-        self._notes[next_id].setSelected(True)
+        if not extend:
+            self._scene.clearSelection()
+        self._item(next_id).setSelected(True)
 
-    def select_prev_note(self, from_id: int | None = None) -> None:
-        if not self._notes:
+    def select_prev_note(self, from_id: int | None = None, extend: bool = False) -> None:
+        if not self._sorted_ids:
             return
 
-        sorted_ids = sorted(self._notes.keys())
+        sorted_ids = self._sorted_ids
 
         if from_id is not None:
             current_id = from_id
         else:
-            current = self.get_selected_note()
-            current_id = current.note_id if current else None
+            selected = self.get_selected_notes()
+            current_id = selected[0].note_id if selected else None
 
         if current_id is None:
             prev_id = sorted_ids[-1]
         else:
-            pos = 0
-            for i, nid in enumerate(sorted_ids):
-                if nid >= current_id:
-                    pos = i
-                    break
-                pos = i + 1
+            pos = bisect.bisect_left(sorted_ids, current_id)
             prev_idx = (pos - 1) % len(sorted_ids)
             prev_id = sorted_ids[prev_idx]
 
+        if not extend:
+            self._scene.clearSelection()
+        self._item(prev_id).setSelected(True)
+
+    def set_search_hits(self, note_ids: Iterable[int]) -> None:
+        hits = set(note_ids)
+        for note_id in hits ^ self._search_hits:
+            item = self._notes.get(note_id)
+            if item is not None:
+                item.set_highlighted(note_id in hits)
+        self._search_hits = hits
+
+    def focus_note(self, note_id: int) -> None:
+        item = self._item(note_id)
+        if item is None:
+            return
         self._scene.clearSelection()
-        self._notes[prev_id].setSelected(True)
+        item.setSelected(True)
+        self.centerOn(item)
+
+    def select_all(self) -> None:
+        for note_id in self._sorted_ids:
+            self._item(note_id).setSelected(True)
 
     def deselect_all(self) -> None:
         self._scene.clearSelection()
@@ -560,15 +955,20 @@ class PinboardCanvas(QGraphicsView):
         return True
 
     def exit_edit_mode(self) -> None:
-        for item in self._notes.values():
-            if item.is_editing():
-                item.exit_edit_mode()
+        if self._editing_item is not None:
+            self._editing_item.exit_edit_mode()
 
     def is_editing(self) -> bool:
-        for item in self._notes.values():
-            if item.is_editing():
-                return True
-        return False
+        return self._editing_item is not None
+
+    def _on_edit_started(self, note_id: int) -> None:
+        if self._editing_item is not None and self._editing_item.note_id != note_id:
+            self._editing_item.exit_edit_mode()
+        self._editing_item = self._notes.get(note_id)
+
+    def _on_edit_finished(self, note_id: int) -> None:
+        if self._editing_item is not None and self._editing_item.note_id == note_id:
+            self._editing_item = None
 
     def keyPressEvent(self, event) -> None:
         if event.key() == Qt.Key.Key_Escape:
@@ -589,7 +989,7 @@ class PinboardCanvas(QGraphicsView):
             self.scale(zoom_factor, zoom_factor)
         else:
             self.scale(1 / zoom_factor, 1 / zoom_factor)
-        self.viewport_changed.emit()
+        self._on_viewport_moved()
 
     def mousePressEvent(self, event) -> None:
         self.setFocus()
@@ -597,16 +997,19 @@ class PinboardCanvas(QGraphicsView):
         if self.is_editing():
             scene_pos = self.mapToScene(event.pos())
             item = self._scene.itemAt(scene_pos, self.transform())
-            editing_item = self.get_selected_note()
-            if editing_item and editing_item.is_editing():
-                if item != editing_item and item != editing_item._text_item:
-                    self.exit_edit_mode()
+            editing_item = self._editing_item
+            if item != editing_item and item != editing_item._text_item:
+                self.exit_edit_mode()
             super().mousePressEvent(event)
             return
 
         if event.button() == Qt.MouseButton.LeftButton:
             scene_pos = self.mapToScene(event.pos())
             item = self._scene.itemAt(scene_pos, self.transform())
+            if not isinstance(item, NoteItem) and event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
+                super().mousePressEvent(event)
+                return
             if not isinstance(item, NoteItem):
                 self._panning = True
                 self._pan_start = event.position()
@@ -619,6 +1022,9 @@ class PinboardCanvas(QGraphicsView):
             return
 
         super().mousePressEvent(event)
+        selected = self.get_selected_notes()
+        if event.button() == Qt.MouseButton.LeftButton and len(selected) > 1:
+            self._drag_origins = {item.note_id: item.pos() for item in selected}
 
     def mouseMoveEvent(self, event) -> None:
         if self._panning and self._pan_start is not None:
@@ -626,7 +1032,6 @@ class PinboardCanvas(QGraphicsView):
             self._pan_start = event.position()
             self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - int(delta.x()))
             self.verticalScrollBar().setValue(self.verticalScrollBar().value() - int(delta.y()))
-            self.viewport_changed.emit()
             event.accept()
             return
         super().mouseMoveEvent(event)
@@ -639,3 +1044,6 @@ class PinboardCanvas(QGraphicsView):
             event.accept()
             return
         super().mouseReleaseEvent(event)
+        self.setDragMode(QGraphicsView.DragMode.NoDrag)
+        if self._drag_origins:
+            self._finish_group_drag()
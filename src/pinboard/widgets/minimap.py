@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import QRectF, Qt
-from PySide6.QtGui import QColor, QPainter, QPen, QBrush
+from PySide6.QtGui import QColor, QImage, QPainter, QPen, QBrush, QPixmap
 from PySide6.QtWidgets import QWidget
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pinboard.coalescer import CanvasUpdate
+
 if TYPE_CHECKING:
     from widgets.canvas import PinboardCanvas
 
@@ -13,6 +21,10 @@ MINIMAP_WIDTH = 150
 MINIMAP_HEIGHT = 100
 MINIMAP_MARGIN = 16
 MINIMAP_PADDING = 4
+DENSITY_THRESHOLD = 2000
+MIN_DENSITY_ALPHA = 96
+
+NoteBox = tuple[float, float, float, float, tuple[int, int, int, int]]  # x, y, width, height, color
 
 
 class MinimapWidget(QWidget):
@@ -22,6 +34,11 @@ class MinimapWidget(QWidget):
         self.setFixedSize(MINIMAP_WIDTH, MINIMAP_HEIGHT)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
+        self._boxes: dict[int, NoteBox] = {}
+        self._note_bounds: tuple[float, float, float, float] | None = None
+        self._layer: QPixmap | None = None
+        self._needs_reload = True
+
     def reposition(self) -> None:
         if not self.parent():
             return
@@ -31,8 +48,32 @@ class MinimapWidget(QWidget):
         self.move(x, y)
         self.raise_()
 
+    def on_canvas_updated(self, update: CanvasUpdate) -> None:
+        if update.reloaded:
+            self._needs_reload = True
+            self._layer = None
+        elif update.note_ids:
+            for note_id in update.note_ids:
+                self._refresh_box(note_id)
+            self._note_bounds = self._canvas.notes_bounds()
+            self._layer = None
+        self.update()
+
+    def _refresh_box(self, note_id: int) -> None:
+        box = self._canvas.note_box(note_id)
+        if box is None:
+            self._boxes.pop(note_id, None)
+        else:
+            self._boxes[note_id] = box
+
+    def _reload(self) -> None:
+        self._needs_reload = False
+        self._boxes.clear()
+        for note_id in self._canvas.note_ids():
+            self._refresh_box(note_id)
+        self._note_bounds = self._canvas.notes_bounds()
+
     def _get_bounds(self) -> tuple[float, float, float, float]:
-        notes = self._canvas._notes.values()
         viewport_rect = self._canvas.viewport().rect()
         top_left = self._canvas.mapToScene(viewport_rect.topLeft())
         bottom_right = self._canvas.mapToScene(viewport_rect.bottomRight())
@@ -42,13 +83,10 @@ class MinimapWidget(QWidget):
         vp_max_x = bottom_right.x()
         vp_max_y = bottom_right.y()
 
-        if not notes:
+        if self._note_bounds is None:
             return vp_min_x, vp_min_y, vp_max_x, vp_max_y
 
-        note_min_x = min(n.pos().x() for n in notes)
-        note_min_y = min(n.pos().y() for n in notes)
-        note_max_x = max(n.pos().x() + n.rect().width() for n in notes)
-        note_max_y = max(n.pos().y() + n.rect().height() for n in notes)
+        note_min_x, note_min_y, note_max_x, note_max_y = self._note_bounds
 
         min_x = min(vp_min_x, note_min_x)
         min_y = min(vp_min_y, note_min_y)
@@ -57,7 +95,66 @@ class MinimapWidget(QWidget):
 
         return min_x, min_y, max_x, max_y
 
+    def _build_layer(self, width: float, height: float) -> QPixmap:
+        min_x, min_y, max_x, max_y = self._note_bounds
+        ratio = self.devicePixelRatioF()
+        scale = min(width / max(max_x - min_x, 1), height / max(max_y - min_y, 1)) * ratio
+        pixel_width = max(1, math.ceil((max_x - min_x) * scale))
+        pixel_height = max(1, math.ceil((max_y - min_y) * scale))
+
+        if np is not None and len(self._boxes) >= DENSITY_THRESHOLD:
+            return QPixmap.fromImage(self._density_image(min_x, min_y, scale, pixel_width, pixel_height))
+
+        layer = QPixmap(pixel_width, pixel_height)
+        layer.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(layer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor(100, 100, 100), 0.5))
+        colors: dict[tuple[int, int, int, int], QColor] = {}
+        for x, y, w, h, color in self._boxes.values():
+            qcolor = colors.get(color)
+            if qcolor is None:
+                qcolor = colors[color] = QColor(*color)
+            rect = QRectF((x - min_x) * scale, (y - min_y) * scale, w * scale, h * scale)
+            painter.fillRect(rect, qcolor)
+            painter.drawRect(rect)
+        painter.end()
+        return layer
+
+    def _density_image(self, min_x: float, min_y: float, scale: float, width: int, height: int) -> QImage:
+        boxes = np.array([box[:4] + box[4][:3] for box in self._boxes.values()], dtype=np.float64)
+        x0 = np.clip(np.floor((boxes[:, 0] - min_x) * scale), 0, width - 1).astype(np.intp)
+        y0 = np.clip(np.floor((boxes[:, 1] - min_y) * scale), 0, height - 1).astype(np.intp)
+        x1 = np.maximum(np.clip(np.ceil((boxes[:, 0] + boxes[:, 2] - min_x) * scale), 0, width), x0 + 1)
+        y1 = np.maximum(np.clip(np.ceil((boxes[:, 1] + boxes[:, 3] - min_y) * scale), 0, height), y0 + 1)
+        x1 = x1.astype(np.intp)
+        y1 = y1.astype(np.intp)
+
+        # Add each note rect to a 2D difference array; two cumulative sums then give per-pixel coverage.
+        stride = width + 1
+        corners = np.concatenate([y0 * stride + x0, y0 * stride + x1, y1 * stride + x0, y1 * stride + x1])
+        signs = np.repeat([1.0, -1.0, -1.0, 1.0], len(boxes))
+        size = (height + 1) * stride
+
+        def coverage(weights):
+            grid = np.bincount(corners, weights=signs * np.tile(weights, 4), minlength=size)
+            return grid.reshape(height + 1, stride).cumsum(axis=0).cumsum(axis=1)[:height, :width]
+
+        count = coverage(np.ones(len(boxes)))
+        covered = count > 0.5
+        safe_count = np.where(covered, count, 1.0)
+        rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        for channel in range(3):
+            rgba[..., channel] = np.clip(coverage(boxes[:, 4 + channel]) / safe_count, 0, 255)
+        density = np.log1p(np.where(covered, count, 0.0)) / math.log1p(max(count.max(), 1.0))
+        rgba[..., 3] = np.where(covered, MIN_DENSITY_ALPHA + (255 - MIN_DENSITY_ALPHA) * density, 0)
+
+        return QImage(rgba.tobytes(), width, height, width * 4, QImage.Format.Format_RGBA8888).copy()
+
     def paintEvent(self, event) -> None:
+        if self._needs_reload:
+            self._reload()
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
@@ -94,14 +191,14 @@ class MinimapWidget(QWidget):
                 offset_y + (y - min_y) * scale,
             )
 
-        for note in self._canvas._notes.values():
-            nx, ny = to_minimap(note.pos().x(), note.pos().y())
-            nw = note.rect().width() * scale
-            nh = note.rect().height() * scale
-            r, g, b, a = note.color
-            painter.fillRect(QRectF(nx, ny, nw, nh), QColor(r, g, b, a))
-            painter.setPen(QPen(QColor(100, 100, 100), 0.5))
-            painter.drawRect(QRectF(nx, ny, nw, nh))
+        if self._note_bounds is not None:
+            if self._layer is None:
+                self._layer = self._build_layer(draw_area.width(), draw_area.height())
+            note_min_x, note_min_y, note_max_x, note_max_y = self._note_bounds
+            nx, ny = to_minimap(note_min_x, note_min_y)
+            target = QRectF(nx, ny, (note_max_x - note_min_x) * scale, (note_max_y - note_min_y) * scale)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(target, self._layer, QRectF(self._layer.rect()))
 
         viewport_rect = self._canvas.viewport().rect()
         top_left = self._canvas.mapToScene(viewport_rect.topLeft())
@@ -4,7 +4,7 @@ from PySide6.QtCore import QRectF, Qt, Signal, QObject
 from PySide6.QtGui import QBrush, QColor, QFont, QFontMetrics, QPainter, QPen
 from PySide6.QtWidgets import QGraphicsItem, QGraphicsRectItem, QGraphicsTextItem, QStyle, QStyleOptionGraphicsItem
 
-from pinboard.models.note import utc_now
+from pinboard.models.note import Note, utc_now
 
 MIN_WIDTH = 100
 MIN_HEIGHT = 60
@@ -12,6 +12,19 @@ HANDLE_SIZE = 10
 PADDING = 8
 SELECTION_BORDER_WIDTH = 3
 SELECTION_BORDER_COLOR = (0, 150, 255, 255)
+HIGHLIGHT_BORDER_COLOR = (255, 170, 0, 255)
+HANDLE_COLOR = (80, 80, 80, 255)
+
+
+_fonts: dict[tuple[str, int], tuple[QFont, QFontMetrics]] = {}
+
+
+def shared_font(family: str, size: int) -> tuple[QFont, QFontMetrics]:
+    key = (family, size)
+    if key not in _fonts:
+        font = QFont(family, size)
+        _fonts[key] = (font, QFontMetrics(font))
+    return _fonts[key]
 
 
 class NoteSignals(QObject):
@@ -19,7 +32,8 @@ class NoteSignals(QObject):
     resized = Signal(int, float, float, float, float)  # id, old_w, old_h, new_w, new_h
     text_changed = Signal(int, str, str)  # id, old_text, new_text
     changed = Signal()
-    edit_finished = Signal()
+    edit_started = Signal(int)  # id
+    edit_finished = Signal(int)  # id
 
 
 class EditableTextItem(QGraphicsTextItem):
@@ -36,6 +50,8 @@ class EditableTextItem(QGraphicsTextItem):
 
 
 class NoteItem(QGraphicsRectItem):
+    paint_calls = 0  # across all items; the canvas diffs it around each frame
+
     def __init__(
         self,
         note_id: int,
@@ -49,6 +65,8 @@ class NoteItem(QGraphicsRectItem):
         text_color: tuple[int, int, int, int],
         font_family: str,
         font_size: int,
+        lod_text_threshold: float,
+        lod_title_threshold: float,
         created_at: str | None = None,
         edited_at: str | None = None,
         adjusted_at: str | None = None,
@@ -63,6 +81,8 @@ class NoteItem(QGraphicsRectItem):
         self.text_color = text_color
         self.font_family = font_family
         self.font_size = font_size
+        self.lod_text_threshold = lod_text_threshold
+        self.lod_title_threshold = lod_title_threshold
         self.created_at = created_at
         self.edited_at = edited_at
         self.adjusted_at = adjusted_at
@@ -86,8 +106,35 @@ class NoteItem(QGraphicsRectItem):
         self._text_item: EditableTextItem | None = None
         self._edit_start_text: str = ""
 
+        r, g, b, a = text_color
+        self._text_pen = QPen(QColor(r, g, b, a))
+        r, g, b, a = SELECTION_BORDER_COLOR
+        self._selection_pen = QPen(QColor(r, g, b, a), SELECTION_BORDER_WIDTH)
+        self._selection_color = QColor(r, g, b, a)
+        r, g, b, a = HIGHLIGHT_BORDER_COLOR
+        self._highlight_pen = QPen(QColor(r, g, b, a), SELECTION_BORDER_WIDTH)
+        self._highlight_color = QColor(r, g, b, a)
+        self._highlighted = False
+        self._layout_key: tuple | None = None
+        self._layout: list[str] = []
+
         self._update_appearance()
 
+    def to_note(self) -> Note:
+        return Note(
+            id=self.note_id,
+            x=self.pos().x(),
+            y=self.pos().y(),
+            width=self.rect().width(),
+            height=self.rect().height(),
+            text=self.text,
+            order=self.order,
+            color=self.color,
+            created_at=self.created_at,
+            edited_at=self.edited_at,
+            adjusted_at=self.adjusted_at,
+        )
+
     def _update_appearance(self) -> None:
         r, g, b, a = self.color
         self.setBrush(QBrush(QColor(r, g, b, a)))
@@ -100,6 +147,11 @@ class NoteItem(QGraphicsRectItem):
         self._update_appearance()
         self.update()
 
+    def set_highlighted(self, highlighted: bool) -> None:
+        if self._highlighted != highlighted:
+            self._highlighted = highlighted
+            self.update()
+
     def set_order(self, order: int) -> None:
         if self.order != order:
             self.adjusted_at = utc_now()
@@ -108,77 +160,117 @@ class NoteItem(QGraphicsRectItem):
 
     def set_text(self, text: str) -> None:
         self.text = text
+        self._layout_key = None
         self.update()
 
+    def setRect(self, *args) -> None:
+        super().setRect(*args)
+        self._layout_key = None
+
+    def _layout_lines(self, width: float, height: float) -> list[str]:
+        key = (self.text, width, height, self.font_family, self.font_size)
+        if key != self._layout_key:
+            self._layout = self._wrap_text(int(width), height)
+            self._layout_key = key
+        return self._layout
+
+    def _wrap_text(self, available_width: int, available_height: float) -> list[str]:
+        _, metrics = shared_font(self.font_family, self.font_size)
+        max_lines = max(1, int(available_height / metrics.lineSpacing()))
+        space_width = metrics.horizontalAdvance(" ")
+
+        wrapped_lines: list[str] = []
+        for paragraph in self.text.split("\n"):
+            if len(wrapped_lines) > max_lines:
+                break
+            if not paragraph:
+                wrapped_lines.append("")
+                continue
+            current_line = ""
+            current_width = 0
+            for word in paragraph.split(" "):
+                if not word:
+                    continue
+                word_width = metrics.horizontalAdvance(word)
+                test_line = f"{current_line} {word}" if current_line else word
+                test_width = current_width + space_width + word_width if current_line else word_width
+                if test_width > available_width and current_line:
+                    test_width = metrics.horizontalAdvance(test_line)
+                if test_width <= available_width:
+                    current_line = test_line
+                    current_width = test_width
+                    continue
+                if current_line:
+                    wrapped_lines.append(current_line)
+                    if len(wrapped_lines) > max_lines:
+                        break
+                if word_width > available_width:
+                    current_line = metrics.elidedText(word, Qt.TextElideMode.ElideRight, available_width)
+                    current_width = metrics.horizontalAdvance(current_line)
+                else:
+                    current_line = word
+                    current_width = word_width
+            else:
+                if current_line:
+                    wrapped_lines.append(current_line)
+
+        if len(wrapped_lines) > max_lines:
+            last = wrapped_lines[max_lines - 1]
+            ellipsis_width = metrics.horizontalAdvance("...")
+            wrapped_lines = wrapped_lines[: max_lines - 1]
+            wrapped_lines.append(
+                metrics.elidedText(last, Qt.TextElideMode.ElideRight, available_width - ellipsis_width) + "..."
+            )
+        return wrapped_lines
+
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None) -> None:
+        NoteItem.paint_calls += 1
+        rect = self.rect()
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+
+        if lod < self.lod_title_threshold and not self._editing:
+            if self.isSelected():
+                painter.fillRect(rect, self._selection_color)
+            elif self._highlighted:
+                painter.fillRect(rect, self._highlight_color)
+            else:
+                painter.fillRect(rect, self.brush().color())
+            return
+
         option.state &= ~QStyle.StateFlag.State_Selected
         super().paint(painter, option, widget)
 
-        rect = self.rect()
-
         if not self._editing:
             text_rect = rect.adjusted(PADDING, PADDING, -PADDING, -PADDING)
-
-            font = QFont(self.font_family, self.font_size)
+            font, metrics = shared_font(self.font_family, self.font_size)
             painter.setFont(font)
-            r, g, b, a = self.text_color
-            painter.setPen(QPen(QColor(r, g, b, a)))
-
-            metrics = QFontMetrics(font)
-            available_width = int(text_rect.width())
-            available_height = text_rect.height()
-            line_height = metrics.lineSpacing()
-            max_lines = max(1, int(available_height / line_height))
+            painter.setPen(self._text_pen)
 
-            wrapped_lines = []
-            for paragraph in self.text.split("\n"):
-                if not paragraph:
-                    wrapped_lines.append("")
-                    continue
-                words = paragraph.split(" ")
-                current_line = ""
-                for word in words:
-                    test_line = f"{current_line} {word}".strip() if current_line else word
-                    if metrics.horizontalAdvance(test_line) <= available_width:
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            wrapped_lines.append(current_line)
-                        if metrics.horizontalAdvance(word) > available_width:
-                            current_line = metrics.elidedText(word, Qt.TextElideMode.ElideRight, available_width)
-                        else:
-                            current_line = word
-                if current_line:
-                    wrapped_lines.append(current_line)
+            lines = self._layout_lines(text_rect.width(), text_rect.height())
+            if lod < self.lod_text_threshold:
+                lines = lines[:1]
 
-            y_offset = text_rect.top()
-            for i, line in enumerate(wrapped_lines):
-                if i >= max_lines:
-                    break
-                if i == max_lines - 1 and len(wrapped_lines) > max_lines:
-                    line = (
-                        metrics.elidedText(
-                            line, Qt.TextElideMode.ElideRight, available_width - metrics.horizontalAdvance("...")
-                        )
-                        + "..."
-                    )
-                painter.drawText(
-                    int(text_rect.left()),
-                    int(y_offset + metrics.ascent()),
-                    line,
-                )
+            line_height = metrics.lineSpacing()
+            y_offset = text_rect.top() + metrics.ascent()
+            for line in lines:
+                painter.drawText(int(text_rect.left()), int(y_offset), line)
                 y_offset += line_height
 
+        if self._highlighted and not self.isSelected():
+            painter.setPen(self._highlight_pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            inset = SELECTION_BORDER_WIDTH / 2
+            painter.drawRect(rect.adjusted(inset, inset, -inset, -inset))
+
         if self.isSelected():
-            r, g, b, a = SELECTION_BORDER_COLOR
-            selection_pen = QPen(QColor(r, g, b, a), SELECTION_BORDER_WIDTH)
-            painter.setPen(selection_pen)
+            painter.setPen(self._selection_pen)
             painter.setBrush(Qt.BrushStyle.NoBrush)
             inset = SELECTION_BORDER_WIDTH / 2
             painter.drawRect(rect.adjusted(inset, inset, -inset, -inset))
 
-            handle_rect = self._get_handle_rect("br")
-            painter.fillRect(handle_rect, QColor(80, 80, 80))
+            if lod >= self.lod_text_threshold:
+                r, g, b, a = HANDLE_COLOR
+                painter.fillRect(self._get_handle_rect("br"), QColor(r, g, b, a))
 
     def _get_handle_rect(self, corner: str) -> QRectF:
         rect = self.rect()
@@ -274,7 +366,7 @@ class NoteItem(QGraphicsRectItem):
 
         self._text_item = EditableTextItem(self)
         self._text_item.setPlainText(self.text)
-        self._text_item.setFont(QFont(self.font_family, self.font_size))
+        self._text_item.setFont(shared_font(self.font_family, self.font_size)[0])
         r, g, b, a = self.text_color
         self._text_item.setDefaultTextColor(QColor(r, g, b, a))
         self._text_item.setPos(PADDING, PADDING)
@@ -289,6 +381,7 @@ class NoteItem(QGraphicsRectItem):
 
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
         self.update()
+        self.signals.edit_started.emit(self.note_id)
 
     def exit_edit_mode(self) -> None:
         if not self._editing or not self._text_item:
@@ -312,7 +405,7 @@ class NoteItem(QGraphicsRectItem):
 
         self._edit_start_text = ""
         self.update()
-        self.signals.edit_finished.emit()
+        self.signals.edit_finished.emit(self.note_id)
 
     def hoverMoveEvent(self, event) -> None:
         if self.isSelected() and self._get_corner_at(event.pos()) == "br":
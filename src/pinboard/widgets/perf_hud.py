@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QElapsedTimer, Qt, QTimer
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PySide6.QtWidgets import QWidget
+
+if TYPE_CHECKING:
+    from pinboard.api import PinboardAPI
+    from pinboard.undo_manager import UndoManager
+    from pinboard.widgets.canvas import PinboardCanvas
+
+HUD_COLUMNS = 44
+HUD_MARGIN = 16
+HUD_PADDING = 8
+HUD_FONT_SIZE = 10
+REFRESH_MS = 250
+LATENCY_SAMPLES = 8  # two seconds of refreshes
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f} ms"
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
+class PerfHudWidget(QWidget):
+    # Reads counters the canvas, note items, saver and API keep anyway; its own timer, which also
+    # measures event-loop latency, only runs while the HUD is shown.
+
+    def __init__(
+        self, canvas: PinboardCanvas, undo_manager: UndoManager, api: PinboardAPI, parent: QWidget | None = None
+    ):
+        super().__init__(parent)
+        self._canvas = canvas
+        self._undo_manager = undo_manager
+        self._api = api
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        # Opaque, so refreshing the HUD never repaints the canvas underneath and skews its frame stats.
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+        self._font = QFont("monospace", HUD_FONT_SIZE)
+        metrics = QFontMetrics(self._font)
+        self._line_height = metrics.lineSpacing()
+        self._ascent = metrics.ascent()
+        width = metrics.horizontalAdvance("0" * HUD_COLUMNS)
+        self.setFixedSize(2 * HUD_PADDING + width, 2 * HUD_PADDING + 6 * self._line_height)
+
+        self._save: tuple[float, float, int] | None = None  # GUI-thread time, write time, board size
+        self._latencies: deque[int] = deque(maxlen=LATENCY_SAMPLES)
+        self._clock = QElapsedTimer()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def reposition(self) -> None:
+        if not self.parent():
+            return
+        self.move(HUD_MARGIN, HUD_MARGIN)
+        self.raise_()
+
+    def record_save(self, blocked_seconds: float, write_seconds: float, size: int) -> None:
+        self._save = (blocked_seconds, write_seconds, size)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._latencies.clear()
+        self._clock.start()
+        self._timer.start()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def _tick(self) -> None:
+        # How late this timeout fired is how long the event loop was busy with something else.
+        self._latencies.append(max(0, self._clock.restart() - REFRESH_MS))
+        self.update()
+
+    def _lines(self) -> list[str]:
+        frame_seconds, paints = self._canvas.frame_stats()
+        latency = f"{self._latencies[-1]} ms (max {max(self._latencies)} ms)" if self._latencies else "-"
+        if self._save is None:
+            save = "-"
+        else:
+            blocked, written, size = self._save
+            save = f"{_ms(written)} + {_ms(blocked)} GUI, {_mb(size)}"
+        calls, total, last = self._api.callback_stats()
+        return [
+            f"frame   {_ms(frame_seconds)}, {paints} note paints",
+            f"loop    {latency}",
+            f"save    {save}",
+            f"notes   {self._canvas.note_count()}",
+            f"undo    {_mb(self._undo_manager.history_bytes())}",
+            f"config  {_ms(last)} last, {_ms(total)} in {calls} calls",
+        ]
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(30, 30, 30))
+        painter.setPen(QPen(QColor(80, 80, 80), 1))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+
+        painter.setFont(self._font)
+        painter.setPen(QColor(200, 200, 200))
+        y = HUD_PADDING + self._ascent
+        for line in self._lines():
+            painter.drawText(HUD_PADDING, y, line)
+            y += self._line_height
+        painter.end()
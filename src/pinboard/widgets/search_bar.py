@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QLineEdit
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget
+
+PADDING = 8
+TOP_MARGIN = 16
+
+
+class SearchBarWidget(QFrame):
+    query_changed = Signal(str)
+    submitted = Signal(str)
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+
+        self.setStyleSheet(
+            """
+            SearchBarWidget {
+                background-color: rgb(30, 30, 30);
+                border: 2px solid rgb(0, 150, 200);
+            }
+            QLabel, QLineEdit {
+                color: rgb(200, 200, 200);
+                background: transparent;
+                border: none;
+                font-family: monospace;
+                font-size: 16px;
+            }
+        """
+        )
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(PADDING, PADDING, PADDING, PADDING)
+
+        layout.addWidget(QLabel("/"))
+        self._input = QLineEdit()
+        self._input.textChanged.connect(self.query_changed)
+        self._input.returnPressed.connect(lambda: self.submitted.emit(self._input.text()))
+        layout.addWidget(self._input)
+        self._count = QLabel()
+        layout.addWidget(self._count)
+
+    def focus(self) -> None:
+        self._input.setFocus()
+
+    def set_count(self, text: str) -> None:
+        self._count.setText(text)
+
+    def reposition(self) -> None:
+        parent = self.parentWidget()
+        if not parent:
+            return
+
+        parent_rect = parent.rect()
+        self.setFixedWidth(int(parent_rect.width() * 0.5))
+        self.adjustSize()
+        self.move((parent_rect.width() - self.width()) // 2, TOP_MARGIN)
+        self.raise_()
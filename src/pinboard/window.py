@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 
 from PySide6.QtCore import QTimer
@@ -7,11 +8,20 @@ from PySide6.QtGui import QResizeEvent
 from PySide6.QtWidgets import QApplication, QMainWindow
 
 from pinboard.api import pb
+from pinboard.indexer import BackgroundIndexer
+from pinboard.ipc_server import PushServer
 from pinboard.keybindings import setup_keybindings
-from pinboard.storage.yaml_storage import load_config, load_notes, save_notes
+from pinboard.saver import BackgroundSaver
+from pinboard.storage.backend import board_size, load_notes, read_generation
+from pinboard.storage.sqlite_storage import is_sqlite_path
+from pinboard.storage.undo_history import UndoHistory, history_path
+from pinboard.storage.yaml_storage import load_config
 from pinboard.undo_manager import UndoManager
+from pinboard.watcher import BoardWatcher
 from pinboard.widgets.canvas import PinboardCanvas
 from pinboard.widgets.minimap import MinimapWidget
+from pinboard.widgets.perf_hud import PerfHudWidget
+from pinboard.widgets.search_bar import SearchBarWidget
 from pinboard.widgets.text_overlay import TextOverlayWidget
 from pinboard.widgets.toast import ToastManager
 
@@ -28,25 +38,53 @@ class MainWindow(QMainWindow):
         super().__init__()
 
         self._file_path = file_path
-        self._undo_manager = UndoManager()
         self._save_timer = QTimer()
         self._save_timer.setSingleShot(True)
         self._save_timer.timeout.connect(self._save)
+        self._saver = BackgroundSaver(file_path, self)
+        self._saver.failed.connect(self._on_save_failed)
+        self._saver.saved.connect(self._on_saved)
+        self._save_blocked_seconds = 0.0
 
         config = load_config(USER_CONFIG_YAML)
+        self._undo_manager = UndoManager(max_bytes=config.undo_history_mb * 1024 * 1024)
+        self._incremental_save = config.journal or is_sqlite_path(file_path)
         self._canvas = PinboardCanvas(config, self._undo_manager)
         self.setCentralWidget(self._canvas)
+        if config.persistent_undo:
+            history = UndoHistory(history_path(file_path), config.undo_history_mb * 1024 * 1024)
+            self._undo_manager.attach_history(history, self._canvas.restore_action)
 
         self._toast_manager = ToastManager(self)
         self._minimap = MinimapWidget(self._canvas, self)
+        self._perf_hud = PerfHudWidget(self._canvas, self._undo_manager, pb, self)
+        self._perf_hud.hide()
         self._text_overlay: TextOverlayWidget | None = None
-
-        notes = load_notes(file_path)
+        self._search_bar: SearchBarWidget | None = None
+        self._search_query = ""
+        self._search_results: list[int] = []
+        self._search_pos = -1
+        self._indexer = BackgroundIndexer(self._canvas, self)
+        self._indexer.ready.connect(self._on_index_ready)
+
+        # Read before the notes: a write in between then looks concurrent and gets merged, never lost.
+        self._saver.set_generation(read_generation(file_path))
+        notes = load_notes(file_path, use_cache=True)
         self._canvas.load_notes(notes)
 
+        self._watcher = BoardWatcher(file_path, self._canvas, self._saver.is_busy, self)
+        self._watcher.changed.connect(self._canvas.merge_notes)
+        self._watcher.reloaded.connect(self._saver.set_generation)
+        self._watcher.failed.connect(self._on_reload_failed)
+        self._saver.written.connect(self._watcher.acknowledge)
+
+        self._push_server = PushServer(file_path, self._canvas, config, self)
+        self._push_server.notes_pushed.connect(self._on_notes_pushed)
+        self._push_server.listen()
+
         self._canvas.notes_changed.connect(self._schedule_save)
-        self._canvas.notes_changed.connect(self._minimap.update)
-        self._canvas.viewport_changed.connect(self._minimap.update)
+        self._canvas.updated.connect(self._minimap.on_canvas_updated)
+        self._canvas.updated.connect(self._indexer.on_canvas_updated)
 
         setup_keybindings(self)
         self._update_title()
@@ -62,22 +100,23 @@ class MainWindow(QMainWindow):
         super().resizeEvent(event)
         self._toast_manager.reposition()
         self._minimap.reposition()
+        self._perf_hud.reposition()
         if self._text_overlay:
             self._text_overlay.reposition()
+        if self._search_bar:
+            self._search_bar.reposition()
 
     def undo(self) -> None:
         if self._canvas.is_editing():
             return
         if self._undo_manager.undo():
             self._show_toast("Undo")
-            self._schedule_save()
 
     def redo(self) -> None:
         if self._canvas.is_editing():
             return
         if self._undo_manager.redo():
             self._show_toast("Redo")
-            self._schedule_save()
 
     def yank(self) -> None:
         if self._canvas.is_editing():
@@ -113,6 +152,21 @@ class MainWindow(QMainWindow):
             return
         self._canvas.select_prev_note()
 
+    def extend_selection_next(self) -> None:
+        if self._canvas.is_editing():
+            return
+        self._canvas.select_next_note(extend=True)
+
+    def extend_selection_prev(self) -> None:
+        if self._canvas.is_editing():
+            return
+        self._canvas.select_prev_note(extend=True)
+
+    def select_all(self) -> None:
+        if self._canvas.is_editing():
+            return
+        self._canvas.select_all()
+
     def scroll_left(self) -> None:
         if self._canvas.is_editing():
             return
@@ -151,10 +205,13 @@ class MainWindow(QMainWindow):
     def escape(self) -> None:
         if self._close_text_overlay():
             return
+        if self._close_search_bar():
+            return
         if self._canvas.is_editing():
             self._canvas.exit_edit_mode()
         else:
             self._canvas.deselect_all()
+            self._run_search("")
 
     def reset_viewport(self) -> None:
         if self._canvas.is_editing():
@@ -174,6 +231,13 @@ class MainWindow(QMainWindow):
         self._text_overlay.show()
         self._text_overlay.reposition()
 
+    def toggle_perf_hud(self) -> None:
+        if self._perf_hud.isVisible():
+            self._perf_hud.hide()
+            return
+        self._perf_hud.show()
+        self._perf_hud.reposition()
+
     def _close_text_overlay(self) -> bool:
         if not self._text_overlay:
             return False
@@ -181,13 +245,67 @@ class MainWindow(QMainWindow):
         self._text_overlay = None
         return True
 
+    def open_search(self) -> None:
+        if self._canvas.is_editing():
+            return
+        if not self._search_bar:
+            self._search_bar = SearchBarWidget(self)
+            self._search_bar.query_changed.connect(self._run_search)
+            self._search_bar.submitted.connect(self._submit_search)
+            self._search_bar.show()
+            self._search_bar.reposition()
+        self._search_bar.focus()
+
+    def next_search_result(self) -> None:
+        self._step_search(1)
+
+    def prev_search_result(self) -> None:
+        self._step_search(-1)
+
+    def _close_search_bar(self) -> bool:
+        if not self._search_bar:
+            return False
+        self._search_bar.deleteLater()
+        self._search_bar = None
+        self._canvas.setFocus()
+        return True
+
+    def _run_search(self, query: str) -> None:
+        self._search_query = query
+        self._search_results = self._indexer.search(query) if query else []
+        self._search_pos = -1
+        self._canvas.set_search_hits(self._search_results)
+        if self._search_bar:
+            if self._indexer.is_building():
+                self._search_bar.set_count("indexing...")
+            else:
+                self._search_bar.set_count(str(len(self._search_results)) if query else "")
+
+    def _submit_search(self, query: str) -> None:
+        self._close_search_bar()
+        if query:
+            self._step_search(1)
+
+    def _step_search(self, step: int) -> None:
+        if self._canvas.is_editing() or not self._search_query:
+            return
+        if not self._search_results:
+            self._show_toast(f"No matches for {self._search_query!r}")
+            return
+        self._search_pos = (self._search_pos + step) % len(self._search_results)
+        self._canvas.focus_note(self._search_results[self._search_pos])
+        self._show_toast(f"{self._search_pos + 1}/{len(self._search_results)}")
+
+    def _on_index_ready(self) -> None:
+        if self._search_query:
+            self._run_search(self._search_query)
+
     def quit(self) -> None:
         if self._close_text_overlay():
             return
         if self._canvas.is_editing():
             return
-        self._save_timer.stop()
-        self._save()
+        self._flush_save()
         self._show_toast("Saved")
         QApplication.quit()
 
@@ -195,15 +313,49 @@ class MainWindow(QMainWindow):
         self._save_timer.start(SAVE_DEBOUNCE_MS)
 
     def _save(self) -> None:
-        notes = self._canvas.get_notes()
-        save_notes(self._file_path, notes)
+        if self._watcher.is_pending():
+            # Merge the other writer's edits first so this save does not overwrite them.
+            self._schedule_save()
+            return
+        start = time.perf_counter()
+        if self._incremental_save:
+            changes = self._canvas.take_changes()
+            if not changes:
+                return
+            self._saver.save_changes(changes)
+        elif not self._canvas.has_changes():
+            return
+        else:
+            self._saver.save(self._canvas.snapshot(), self._canvas.take_changed_ids())
+        self._save_blocked_seconds = time.perf_counter() - start
+
+    def _flush_save(self) -> None:
+        self._save_timer.stop()
+        if is_sqlite_path(self._file_path):
+            self._saver.flush_changes(self._canvas.take_changes())
+            return
+        self._saver.flush(self._canvas.snapshot(), self._canvas.take_changed_ids())
+
+    def _on_saved(self, seconds: float) -> None:
+        self._perf_hud.record_save(self._save_blocked_seconds, seconds, board_size(str(self._file_path)))
+
+    def _on_save_failed(self, message: str) -> None:
+        self._show_toast(f"Save failed: {message}")
+
+    def _on_reload_failed(self, message: str) -> None:
+        self._show_toast(f"Reload failed: {message}")
+
+    def _on_notes_pushed(self, count: int) -> None:
+        self._show_toast(f"Pushed {count} note{'s' if count != 1 else ''}")
 
     def _update_title(self) -> None:
         self.setWindowTitle(f"Pinboard - {self._file_path.name}")
 
     def closeEvent(self, event) -> None:
-        self._save_timer.stop()
-        self._save()
+        self._push_server.close()
+        self._watcher.close()
+        self._flush_save()
+        self._undo_manager.close()
         event.accept()
 
 